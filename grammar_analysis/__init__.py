@@ -0,0 +1,41 @@
+# Grammar analysis library: FIRST and FOLLOW sets, SLR, LALR and LR(1) tables
+# and parsers that can be built once and reused in-process, fed by a lexer
+
+from .first_follow import FirstFollow, NonRecursiveFirstFollow
+from .grammar import EOF, EPSILON, LEFT, NONASSOC, RIGHT, Grammar
+from .incremental import IncrementalParser
+from .lalr_table import LALRTable
+from .lexer import Lexer, LexingError
+from .lr1_table import CanonicalLR1Table, LR1Table
+from .parse_tree import ParseTree
+from .push_parser import PushParser, recognizeAsync
+from .semantic_actions import SemanticActions
+from .slr_parser import SLRParser
+from .slr_table import SLRTable, TableConflict, TableConflictError
+from .table_cache import loadOrBuildTable
+
+__all__ = [
+    "CanonicalLR1Table",
+    "EOF",
+    "EPSILON",
+    "FirstFollow",
+    "Grammar",
+    "IncrementalParser",
+    "LALRTable",
+    "LEFT",
+    "LR1Table",
+    "Lexer",
+    "LexingError",
+    "NONASSOC",
+    "NonRecursiveFirstFollow",
+    "ParseTree",
+    "PushParser",
+    "RIGHT",
+    "SLRParser",
+    "SLRTable",
+    "SemanticActions",
+    "TableConflict",
+    "TableConflictError",
+    "loadOrBuildTable",
+    "recognizeAsync",
+]
@@ -0,0 +1,67 @@
+# Parsing of many strings, optionally spread across worker processes
+
+import multiprocessing
+import os
+from itertools import islice
+
+BATCH_CHUNK_SIZE = 128
+
+# Chunks of strings read at a time for each worker, which bounds
+# how far reading gets ahead of the results
+BATCH_CHUNKS_PER_WORKER = 4
+
+# Parse function of the running batch, set before forking the
+# workers so they inherit it instead of receiving a pickled copy
+batchParseFunction = None
+
+def parseWithBatchFunction(tokens):
+    '''
+    Applies the parse function of the running batch to a string,
+    used as the task of the worker processes.
+    Arguments:
+        tokens: the tokens of a string
+    Returns:
+        the result of the parse function
+    '''
+    return batchParseFunction(tokens)
+
+def parseStrings(parseFunction, tokenLists, jobs = 1):
+    '''
+    Parses a sequence of strings, spreading them across a pool of
+    worker processes when more than one job is requested. Workers
+    are forked after the tables are built, so they share them
+    instead of receiving a copy. Strings are read in windows of a few
+    chunks per worker, the next window being parsed while the results
+    of the previous one are consumed, so the iterable can be larger
+    than the memory.
+    Arguments:
+        parseFunction: the parse driver to apply to each string
+        tokenLists: an iterable of lists of tokens
+        jobs: the number of worker processes, 0 uses every core
+    Returns:
+        an iterable with the result of each string, in input order
+    '''
+    global batchParseFunction
+
+    if jobs == 0:
+        jobs = os.cpu_count()
+
+    if jobs <= 1:
+        yield from map(parseFunction, tokenLists)
+        return
+
+    batchParseFunction = parseFunction
+    with multiprocessing.get_context("fork").Pool(jobs) as pool:
+        tokenListIterator = iter(tokenLists)
+        windowSize = BATCH_CHUNK_SIZE * BATCH_CHUNKS_PER_WORKER * jobs
+        pendingResults = None
+        while True:
+            window = list(islice(tokenListIterator, windowSize))
+            windowResults = None
+            if len(window) > 0:
+                windowResults = pool.imap(parseWithBatchFunction, window, chunksize=BATCH_CHUNK_SIZE)
+            if pendingResults is not None:
+                yield from pendingResults
+            if windowResults is None:
+                break
+            pendingResults = windowResults
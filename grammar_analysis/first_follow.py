@@ -0,0 +1,395 @@
+# FIRST and FOLLOW sets of a grammar's non-terminals, stored as bitsets
+# with one bit per terminal
+
+from .grammar import BODY_START_INDEX, EOF, EPSILON, body, header
+
+def getTerminalBits(terminalsArray):
+    '''
+    Gives each terminal its own bit so that sets of terminals
+    can be stored as integers.
+    Arguments:
+        terminalsArray: a list of terminals, the index of each
+            one is the position of its bit
+    Returns:
+        a dictionary with the bit mask of each terminal
+    '''
+    terminalBits = dict()
+    for bitIndex in range(len(terminalsArray)):
+        terminalBits[terminalsArray[bitIndex]] = 1 << bitIndex
+    return terminalBits
+
+def bitsetMembers(bitset, terminalsArray):
+    '''
+    Returns the terminals in a bitset, in the order of their bits.
+    Arguments:
+        bitset: an integer with one bit set per terminal
+        terminalsArray: a list of terminals, the index of each
+            one is the position of its bit
+    Returns:
+        a list of terminals
+    '''
+    members = []
+    while bitset:
+        lowestBit = bitset & -bitset
+        members.append(terminalsArray[lowestBit.bit_length() - 1])
+        bitset ^= lowestBit
+    return members
+
+def findStronglyConnectedComponents(graph):
+    '''
+    Finds the strongly connected components of a graph with an
+    iterative version of Tarjan's algorithm.
+    Arguments:
+        graph: a dictionary with the set of successors of each node
+    Returns:
+        a list of components, each one a list of nodes, in topological
+        order: every edge goes from a component to a later one
+    '''
+    indices = dict()
+    lowLinks = dict()
+    nodeStack = []
+    onStack = set()
+    components = []
+
+    for root in graph:
+        if root in indices:
+            continue
+
+        indices[root] = len(indices)
+        lowLinks[root] = indices[root]
+        nodeStack.append(root)
+        onStack.add(root)
+        pendingNodes = [(root, iter(graph[root]))]
+
+        while len(pendingNodes) > 0:
+            node, successors = pendingNodes[-1]
+
+            descended = False
+            for successor in successors:
+                if successor not in indices:
+                    indices[successor] = len(indices)
+                    lowLinks[successor] = indices[successor]
+                    nodeStack.append(successor)
+                    onStack.add(successor)
+                    pendingNodes.append((successor, iter(graph[successor])))
+                    descended = True
+                    break
+                elif successor in onStack:
+                    lowLinks[node] = min(lowLinks[node], indices[successor])
+            if descended:
+                continue
+
+            pendingNodes.pop()
+            if len(pendingNodes) > 0:
+                parent = pendingNodes[-1][0]
+                lowLinks[parent] = min(lowLinks[parent], lowLinks[node])
+
+            if lowLinks[node] == indices[node]:
+                component = []
+                while True:
+                    member = nodeStack.pop()
+                    onStack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    # Tarjan's algorithm finds a component after all the ones it reaches
+    components.reverse()
+    return components
+
+def propagateSeeds(seeds, reverseDependencies, sets):
+    '''
+    Uses a dependency graph to propagate seeds between non-terminals.
+    Non-terminals in the same strongly connected component end up with
+    the same set, so each component is solved once, in topological order.
+    Arguments:
+        seeds: a dictionary with the bitset of tokens to propagate from each non-terminal
+        reverseDependencies: a dictionary with the non-terminals each
+            non-terminal propagates to
+        sets: a dictionary with the bitset of each non-terminal to update
+    '''
+    components = findStronglyConnectedComponents(reverseDependencies)
+
+    componentOf = dict()
+    for componentIndex in range(len(components)):
+        for nonTerminal in components[componentIndex]:
+            componentOf[nonTerminal] = componentIndex
+
+    componentSets = []
+    for component in components:
+        componentSet = 0
+        for nonTerminal in component:
+            componentSet |= seeds[nonTerminal]
+        componentSets.append(componentSet)
+
+    for componentIndex in range(len(components)):
+        componentSet = componentSets[componentIndex]
+        for nonTerminal in components[componentIndex]:
+            sets[nonTerminal] |= componentSet
+            for node in reverseDependencies[nonTerminal]:
+                if componentOf[node] != componentIndex:
+                    componentSets[componentOf[node]] |= componentSet
+
+class FirstFollow:
+    '''
+    The FIRST and FOLLOW sets of every non-terminal of a grammar.
+    Sets are integers with the bits of their terminals set, the end of
+    file token and epsilon have their own bits after the terminals.
+    Firsts and follows are found by propagating seeds through their
+    dependency graphs, so recursive grammars are supported.
+    '''
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.nonTerminals = grammar.nonTerminals
+
+        # Give each terminal a bit, the sets of firsts and follows
+        # are stored as integers with the bits of their terminals set
+        self.bitTerminals = sorted(grammar.terminals) + [EOF, EPSILON]
+        self.terminalBits = getTerminalBits(self.bitTerminals)
+        self.epsilonBit = self.terminalBits[EPSILON]
+
+        self.firsts = dict()
+        self.follows = dict()
+        for nonTerminal in self.nonTerminals:
+            self.firsts[nonTerminal] = 0
+            self.follows[nonTerminal] = 0
+
+        self.calculateFirsts()
+        self.calculateFollows()
+
+    def firstsOfString(self, string, startIndex = 0):
+        '''
+        Return the set of firsts of a string as a bitset.
+        Arguments:
+            string: a python list of grammar symbols
+            startIndex: the index of the first symbol to take into account
+        Returns:
+            The bitset of firsts for the sequence of symbols
+        '''
+        stringFirsts = 0
+        for i in range(startIndex, len(string)):
+            if string[i] in self.nonTerminals:
+                nonTermFirsts = self.firsts[string[i]]
+                stringFirsts |= nonTermFirsts & ~self.epsilonBit
+                if not nonTermFirsts & self.epsilonBit:
+                    return stringFirsts
+            else:
+                stringFirsts |= self.terminalBits[string[i]]
+                return stringFirsts
+        stringFirsts |= self.epsilonBit
+        return stringFirsts
+
+    def firstsOf(self, nonTerminal):
+        '''
+        Returns the firsts of a non-terminal.
+        Arguments:
+            nonTerminal: a non-terminal of the grammar
+        Returns:
+            a list of terminals, it may include epsilon
+        '''
+        return bitsetMembers(self.firsts[nonTerminal], self.bitTerminals)
+
+    def followsOf(self, nonTerminal):
+        '''
+        Returns the follows of a non-terminal.
+        Arguments:
+            nonTerminal: a non-terminal of the grammar
+        Returns:
+            a list of terminals, it may include the end of file token
+        '''
+        return bitsetMembers(self.follows[nonTerminal], self.bitTerminals)
+
+    def markEpsilons(self):
+        '''
+        Adds epsilon to the firsts bitset of every non-terminal that can derive it,
+        using a worklist instead of recursion: a production's header derives
+        epsilon once every symbol in its body is known to derive epsilon.
+        '''
+        productions = self.grammar.productions
+        firsts = self.firsts
+        pendingSymbols = []
+        occurrences = dict()
+        for nonTerminal in self.nonTerminals:
+            occurrences[nonTerminal] = []
+
+        worklist = []
+        for productionIndex in range(len(productions)):
+            production = productions[productionIndex]
+            pendingSymbols.append(0)
+            for i in range(BODY_START_INDEX, len(production)):
+                token = production[i]
+                if token == EPSILON:
+                    continue
+                pendingSymbols[productionIndex] += 1
+                if token in self.nonTerminals:
+                    occurrences[token].append(productionIndex)
+
+            producingNonTerm = header(production)
+            if pendingSymbols[productionIndex] == 0 and not firsts[producingNonTerm] & self.epsilonBit:
+                firsts[producingNonTerm] |= self.epsilonBit
+                worklist.append(producingNonTerm)
+
+        while len(worklist) > 0:
+            nonTerminal = worklist.pop()
+            for productionIndex in occurrences[nonTerminal]:
+                pendingSymbols[productionIndex] -= 1
+                producingNonTerm = header(productions[productionIndex])
+                if pendingSymbols[productionIndex] == 0 and not firsts[producingNonTerm] & self.epsilonBit:
+                    firsts[producingNonTerm] |= self.epsilonBit
+                    worklist.append(producingNonTerm)
+
+    def calculateFirsts(self):
+        '''
+        Finds the firsts of every non-terminal.
+        '''
+        firstsSeeds = dict()
+        reverseFirstsDependencies = dict()
+        for nonTerminal in self.nonTerminals:
+            firstsSeeds[nonTerminal] = 0
+            reverseFirstsDependencies[nonTerminal] = set()
+
+        # Find which non-terminals have epsilon in their firsts
+        self.markEpsilons()
+
+        # Build firsts dependency graph and find firsts seeds
+        for production in self.grammar.productions:
+            if production[BODY_START_INDEX] == EPSILON:
+                continue
+
+            nonTerminal = header(production)
+            for i in range(BODY_START_INDEX, len(production)):
+                token = production[i]
+                if token in self.nonTerminals:
+                    reverseFirstsDependencies[token].add(nonTerminal)
+                    if not self.firsts[token] & self.epsilonBit:
+                        break
+                else:
+                    firstsSeeds[nonTerminal] |= self.terminalBits[token]
+                    break
+
+        # Propagate firsts seeds
+        propagateSeeds(firstsSeeds, reverseFirstsDependencies, self.firsts)
+
+    def calculateFollows(self):
+        '''
+        Finds the follows of every non-terminal, firsts must be known.
+        '''
+        followsSeeds = dict()
+        reverseFollowsDependencies = dict()
+        for nonTerminal in self.nonTerminals:
+            followsSeeds[nonTerminal] = 0
+            reverseFollowsDependencies[nonTerminal] = set()
+
+        # Build follows dependency graph and find follows seeds
+        followsSeeds[self.grammar.startNonTerm] |= self.terminalBits[EOF]
+        for production in self.grammar.productions:
+            for i in range(BODY_START_INDEX, len(production)):
+                token = production[i]
+                if token in self.nonTerminals:
+                    if i < len(production) - 1:
+                        betaFirsts = self.firstsOfString(production, i + 1)
+                        followsSeeds[token] |= betaFirsts & ~self.epsilonBit
+                        if betaFirsts & self.epsilonBit:
+                            reverseFollowsDependencies[header(production)].add(token)
+                    else:
+                        reverseFollowsDependencies[header(production)].add(token)
+
+        # Propagate follows seeds
+        propagateSeeds(followsSeeds, reverseFollowsDependencies, self.follows)
+
+class NonRecursiveFirstFollow(FirstFollow):
+    '''
+    The FIRST and FOLLOW sets of every non-terminal of a grammar, found
+    by recursively calculating and storing the sets each one depends on.
+    It can NOT deal with recursive grammars.
+    '''
+
+    def calculateFirsts(self):
+        '''
+        Finds the firsts of every non-terminal.
+        '''
+        for nonTerminal in self.nonTerminals:
+            self.firstsOfNonTerm(nonTerminal)
+
+    def calculateFollows(self):
+        '''
+        Finds the follows of every non-terminal, firsts must be known.
+        '''
+        self.follows[self.grammar.startNonTerm] |= self.terminalBits[EOF]
+        for nonTerminal in self.nonTerminals:
+            self.followsOfNonTerm(nonTerminal)
+
+    def firstsOfString(self, string, startIndex = 0):
+        '''
+        Return the set of firsts of a string as a bitset, calculating
+        the firsts of its non-terminals if needed.
+        Arguments:
+            string: a python list of grammar symbols
+            startIndex: the index of the first symbol to take into account
+        Returns:
+            The bitset of firsts for the sequence of symbols
+        '''
+        stringFirsts = 0
+        for i in range(startIndex, len(string)):
+            if string[i] in self.nonTerminals:
+                nonTermFirsts = self.firstsOfNonTerm(string[i])
+                stringFirsts |= nonTermFirsts & ~self.epsilonBit
+                if not nonTermFirsts & self.epsilonBit:
+                    return stringFirsts
+            else:
+                stringFirsts |= self.terminalBits[string[i]]
+                return stringFirsts
+        stringFirsts |= self.epsilonBit
+        return stringFirsts
+
+    def firstsOfNonTerm(self, nonTerminal):
+        '''
+        Calculates and stores the bitset of firsts of a non terminal.
+        Arguments:
+            nonTerminal: a grammar's non terminal symbol as a string
+        Returns:
+            The bitset of firsts for the non terminal
+        '''
+        # Return stored set of firsts if its been calculated already
+        if self.firsts[nonTerminal] != 0:
+            return self.firsts[nonTerminal]
+
+        for production in self.grammar.productions:
+            if header(production) == nonTerminal:
+                self.firsts[nonTerminal] |= self.firstsOfString(body(production))
+
+        return self.firsts[nonTerminal]
+
+    def followsOfNonTerm(self, nonTerminal):
+        '''
+        Calculates and stores the bitset of follows for a non terminal.
+        Arguments:
+            nonTerminal: a grammar's non terminal symbol as a string
+        Returns:
+            The bitset of follows for the non terminal
+        '''
+        # Return stored set of follows if its been calculated already
+        follows = self.follows
+        if follows[nonTerminal] != 0 and follows[nonTerminal] != self.terminalBits[EOF]:
+            return follows[nonTerminal]
+
+        for production in self.grammar.productions:
+            prodBody = body(production)
+            addHeaderFollowsFlag = False
+            for i in range(len(prodBody)):
+                if prodBody[i] == nonTerminal:
+                    if i < len(prodBody) - 1:
+                        betaFirsts = self.firstsOfString(prodBody, i + 1)
+                        follows[nonTerminal] |= betaFirsts & ~self.epsilonBit
+                        if betaFirsts & self.epsilonBit:
+                            addHeaderFollowsFlag = True
+                    else:
+                        addHeaderFollowsFlag = True
+
+            if addHeaderFollowsFlag and header(production) != nonTerminal:
+                headerFollows = self.followsOfNonTerm(header(production))
+                follows[nonTerminal] |= headerFollows
+
+        return follows[nonTerminal]
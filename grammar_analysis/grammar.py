@@ -0,0 +1,192 @@
+# Grammar representation shared by the analysis tools: productions as
+# lists of tokens, plus an integer encoding used to build parse tables
+
+import hashlib
+
+EPSILON = '\' \''
+EOF ='$'
+UNIQUE_TOKEN = "A01705249"
+BODY_START_INDEX = 2
+GRAMMAR_HASH_VERSION = 1
+LEFT = "left"
+RIGHT = "right"
+NONASSOC = "nonassoc"
+PRECEDENCE_DECLARATIONS = {"%left": LEFT, "%right": RIGHT, "%nonassoc": NONASSOC}
+PREC_MARKER = "%prec"
+# Terminal that error productions use to stand for the text skipped
+# while recovering from a syntax error
+ERROR_TOKEN = "error"
+
+def header(production):
+    '''
+    Returns the header portion of a grammar's production.
+    Arguments:
+        production: a python list of tokens representing a well-formed production
+    Returns:
+        The production's header as a string
+    '''
+    return production[0]
+
+def body(production):
+    '''
+    Returns the body portion of a grammar's production.
+    Arguments:
+        production: a python list of tokens representing a well-formed production
+    Returns:
+        The production's body as a list of tokens
+    '''
+    return production[2:]
+
+def parseProduction(line):
+    '''
+    Splits a line with a grammar production into tokens, a body
+    made only of a pair of quotes is stored as epsilon.
+    Arguments:
+        line: a string like "A -> b C" or "A -> ' '"
+    Returns:
+        The production as a list of tokens
+    '''
+    production = line.split()
+    if production[2] == '\'' and production[3] == '\'':
+        production.pop()
+        production.pop()
+        production.append(EPSILON)
+    return production
+
+class Grammar:
+    '''
+    A context free grammar. The first production's header is the start
+    non-terminal, and the grammar is augmented with an artificial
+    production that derives it.
+    Symbols are interned to small integers (terminals first, then the
+    end of file token, the non-terminals and the artificial start) and
+    the productions are also stored as a header id and a tuple of
+    body ids, a production's id is its index in augmentedProductions.
+    Terminals can be given a precedence and an associativity, used to
+    resolve the conflicts of the grammar's tables. A production takes
+    the precedence of the last terminal of its body that has one, unless
+    it is given the precedence of another terminal or name explicitly.
+    '''
+
+    def __init__(self, productions, precedences = None, precedenceOverrides = None):
+        self.productions = productions
+        if precedences is None:
+            precedences = []
+        if precedenceOverrides is None:
+            precedenceOverrides = dict()
+        self.precedences = precedences
+        self.precedenceOverrides = precedenceOverrides
+        self.nonTerminals = set()
+        self.terminals = set()
+
+        # Symbols in order of first appearance
+        self.orderedNonTerminals = []
+        self.orderedTerminals = []
+
+        for production in productions:
+            nonTerminal = header(production)
+            if nonTerminal not in self.nonTerminals:
+                self.nonTerminals.add(nonTerminal)
+                self.orderedNonTerminals.append(nonTerminal)
+
+        self.startNonTerm = header(productions[0])
+
+        for production in productions:
+            for token in body(production):
+                if token not in self.nonTerminals and token != EPSILON:
+                    if token not in self.terminals:
+                        self.orderedTerminals.append(token)
+                    self.terminals.add(token)
+        self.symbols = self.terminals.union(self.nonTerminals)
+
+        artificialProduction = [UNIQUE_TOKEN, "->", self.startNonTerm]
+        self.augmentedProductions = [artificialProduction] + productions
+
+        self.symbolNames = (sorted(self.terminals) + [EOF] +
+                            sorted(self.nonTerminals) + [UNIQUE_TOKEN])
+        self.symbolIds = dict()
+        for symbolId in range(len(self.symbolNames)):
+            self.symbolIds[self.symbolNames[symbolId]] = symbolId
+
+        self.nonTerminalIds = set()
+        for nonTerminal in self.nonTerminals:
+            self.nonTerminalIds.add(self.symbolIds[nonTerminal])
+
+        self.productionHeaders = []
+        self.productionBodies = []
+        for production in self.augmentedProductions:
+            self.productionHeaders.append(self.symbolIds[header(production)])
+            encodedBody = []
+            for token in body(production):
+                if token != EPSILON:
+                    encodedBody.append(self.symbolIds[token])
+            self.productionBodies.append(tuple(encodedBody))
+
+        # Precedence level and associativity of terminals and productions,
+        # later declarations bind tighter
+        self.terminalPrecedences = dict()
+        for level in range(len(precedences)):
+            associativity, precedenceTerminals = precedences[level]
+            for terminal in precedenceTerminals:
+                self.terminalPrecedences[terminal] = (level + 1, associativity)
+
+        self.productionPrecedences = []
+        for productionId in range(len(self.augmentedProductions)):
+            productionPrecedence = None
+            for token in body(self.augmentedProductions[productionId]):
+                if token in self.terminalPrecedences:
+                    productionPrecedence = self.terminalPrecedences[token]
+            if productionId - 1 in precedenceOverrides:
+                productionPrecedence = self.terminalPrecedences.get(precedenceOverrides[productionId - 1])
+            self.productionPrecedences.append(productionPrecedence)
+
+    @classmethod
+    def fromLines(cls, lines, precedences = None):
+        '''
+        Builds a grammar from lines with one production each. Lines can
+        also declare the precedence of terminals, like "%left + -",
+        "%right ^" or "%nonassoc ==", each declaration binding tighter
+        than the ones before it. A production can take the precedence of
+        a declared terminal or name by ending with "%prec <name>".
+        Arguments:
+            lines: an iterable of strings like "A -> b C"
+            precedences: a list of pairs of associativity (LEFT, RIGHT or
+                NONASSOC) and list of terminals, from the loosest to the
+                tightest binding, declared before the ones in the lines
+        Returns:
+            A Grammar object
+        '''
+        productions = []
+        declaredPrecedences = []
+        if precedences is not None:
+            declaredPrecedences.extend(precedences)
+        precedenceOverrides = dict()
+
+        for line in lines:
+            tokens = line.split()
+            if len(tokens) > 0 and tokens[0] in PRECEDENCE_DECLARATIONS:
+                declaredPrecedences.append((PRECEDENCE_DECLARATIONS[tokens[0]], tokens[1:]))
+                continue
+
+            if PREC_MARKER in tokens:
+                markerIndex = tokens.index(PREC_MARKER)
+                precedenceOverrides[len(productions)] = tokens[markerIndex + 1]
+                line = " ".join(tokens[:markerIndex])
+            productions.append(parseProduction(line.strip()))
+        return cls(productions, declaredPrecedences, precedenceOverrides)
+
+    def getHash(self):
+        '''
+        Returns a hash of the grammar's content, used to identify it
+        and its compiled tables.
+        Returns:
+            a string with the hexadecimal digest of the grammar
+        '''
+        grammarHash = hashlib.sha256(f"{GRAMMAR_HASH_VERSION}\n".encode())
+        for production in self.productions:
+            grammarHash.update((" ".join(production) + "\n").encode())
+        for associativity, precedenceTerminals in self.precedences:
+            grammarHash.update((associativity + " " + " ".join(precedenceTerminals) + "\n").encode())
+        for productionIndex, precedenceName in sorted(self.precedenceOverrides.items()):
+            grammarHash.update(f"{PREC_MARKER} {productionIndex} {precedenceName}\n".encode())
+        return grammarHash.hexdigest()
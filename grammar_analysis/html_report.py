@@ -0,0 +1,227 @@
+# HTML tables for an SLR table, its item tree and parse processes,
+# written piece by piece to text files
+
+import shutil
+
+from .grammar import EOF
+from .slr_table import ACCEPT
+
+STYLESHEET = "styles.css"
+
+def getSlrTableHeader(terminalsArray, nonTerminalsArray):
+    '''
+    Returns a string representing the header of the SLR table
+    with HTML format.
+    Arguments:
+        terminalsArray: a list of terminals for the actions section
+        nonTerminals: a list of non-terminals for the goto section
+    Returns:
+        a string with HTML format
+    '''
+    headerTitles = f"\t<th> </th>\n"
+    headerTitles += f"\t<th colspan = {len(terminalsArray)}> ACTIONS </th>\n"
+    headerTitles += f"\t<th colspan = {len(nonTerminalsArray)}> GOTO </th>\n"
+    headerTitles = "<tr>\n" + headerTitles + "</tr>\n"
+
+    headerSymbols = f"\t<th> </th>\n"
+    for symbol in terminalsArray + nonTerminalsArray:
+        headerSymbols += f"\t<th> {symbol} </th>\n"
+    headerSymbols = "<tr>\n" + headerSymbols + "</tr>"
+
+    return (headerTitles + headerSymbols)
+
+def getTableHeader(headers):
+    '''
+    Returns a string representing the header of a simple table
+    with HTML format.
+    Arguments:
+        headers: a list of strings for the header of each column
+    Returns:
+        a string with HTML format
+    '''
+    headerCells = ""
+    for title in headers:
+        headerCells += f"\t<th> {title} </th>\n"
+    tableHeader = "<tr>\n" + headerCells + "</tr>\n"
+    return tableHeader
+
+def getTreeTableRow(itemIndex, cellLists):
+    '''
+    Returns a string representing a row of the SLR item tree table
+    with HTML format.
+    Arguments:
+        itemIndex: an integer, the id of a tree item
+        cellLists: a lists of lists, one list to be included per cell
+    Returns:
+        a string with HTML format
+    '''
+    rowCells = [f"\t<td> {itemIndex} </td>\n"]
+    for cellList in cellLists:
+        rowCells.append(f"\t<td class=\"list_cell\">\n")
+        rowCells.append(f"\t\t<ul>\n")
+        for value in cellList:
+            rowCells.append(f"\t\t\t<li> {value} </li>\n")
+        rowCells.append(f"\t\t</ul>\n")
+        rowCells.append(f"\t</td>\n")
+    tableRow = "<tr>\n" + "".join(rowCells) + "</tr>\n"
+    return tableRow
+
+def getTableRow(cellValues):
+    '''
+    Returns a string representing a row of the SLR table
+    with HTML format.
+    Arguments:
+        cellValues: a list of values for each cell
+    Returns:
+        a string with HTML format
+    '''
+    rowCells = []
+    for value in cellValues:
+        rowCells.append(f"\t<td> {value} </td>\n")
+    tableRow = "<tr>\n" + "".join(rowCells) + "</tr>\n"
+    return tableRow
+
+def writeTableStart(outputFile, header):
+    '''
+    Writes the opening of a table with HTML format,
+    its rows can be written right after it.
+    Arguments:
+        outputFile: a text file to write to
+        header: an HTML string representing a table header
+    '''
+    outputFile.write("<table>\n")
+    outputFile.write(header)
+
+def writeTableEnd(outputFile):
+    '''
+    Writes the closing of a table with HTML format.
+    Arguments:
+        outputFile: a text file to write to
+    '''
+    outputFile.write("</table>\n")
+
+def writeHtmlDocStart(outputFile):
+    '''
+    Writes the opening of an HTML document with a link
+    to a stylesheet, up to the start of its body.
+    Arguments:
+        outputFile: a text file to write to
+    '''
+    outputFile.write("<!DOCTYPE html>\n")
+    outputFile.write("<html>\n")
+    outputFile.write("<head>\n")
+    outputFile.write(f"\t<link rel=\'stylesheet\' href=\'{STYLESHEET}\'>\n")
+    outputFile.write("\t<title> SLR table </title>\n")
+    outputFile.write("</head>\n")
+    outputFile.write("<body>\n")
+
+def writeHtmlHeading(outputFile, heading):
+    '''
+    Writes an h1 heading with HTML format.
+    Arguments:
+        outputFile: a text file to write to
+        heading: the content of the heading
+    '''
+    outputFile.write(f"<h1>{heading}</h1>\n")
+
+def writeHtmlSection(outputFile, heading, sectionFile):
+    '''
+    Writes an h1 heading followed by the HTML element stored
+    in a file, which is copied in chunks.
+    Arguments:
+        outputFile: a text file to write to
+        heading: the content of the heading
+        sectionFile: a text file with the HTML element
+    '''
+    writeHtmlHeading(outputFile, heading)
+    sectionFile.seek(0)
+    shutil.copyfileobj(sectionFile, outputFile)
+    outputFile.write("\n")
+
+def writeHtmlDocEnd(outputFile):
+    '''
+    Writes the closing of an HTML document.
+    Arguments:
+        outputFile: a text file to write to
+    '''
+    outputFile.write("</body>\n")
+    outputFile.write("</html>\n")
+    outputFile.write("\n")
+
+def writeSlrTable(outputFile, table):
+    '''
+    Writes the actions and gotos of every item of an SLR table
+    as a table with HTML format.
+    Arguments:
+        outputFile: a text file to write to
+        table: an SLRTable object
+    '''
+    nonTerminalsArray = sorted(table.grammar.nonTerminals)
+    terminalsArray = sorted(table.grammar.terminals)
+    terminalsArray.append(EOF)
+
+    slrTableHeader = getSlrTableHeader(terminalsArray, nonTerminalsArray)
+    writeTableStart(outputFile, slrTableHeader)
+
+    for itemIndex in range(table.numberOfItems()):
+        cellValues = [itemIndex]
+        for terminal in terminalsArray:
+            if terminal in table.itemActions[itemIndex].keys():
+                actionType = table.itemActions[itemIndex][terminal][0]
+                actionParameter = table.itemActions[itemIndex][terminal][1]
+                if actionType == ACCEPT:
+                    actionParameter = ""
+                cellValues.append(f"{actionType}{actionParameter}")
+            else:
+                cellValues.append("")
+
+        for nonTerminal in nonTerminalsArray:
+            if nonTerminal in table.itemTransitions[itemIndex].keys():
+                destinationIndex = table.itemTransitions[itemIndex][nonTerminal]
+                cellValues.append(destinationIndex)
+            else:
+                cellValues.append("")
+
+        outputFile.write(getTableRow(cellValues))
+
+    writeTableEnd(outputFile)
+
+def writeTreeTable(outputFile, table):
+    '''
+    Writes the kernel, whole list of productions and transitions
+    of every item of an SLR table as a table with HTML format.
+    Arguments:
+        outputFile: a text file to write to
+        table: an SLRTable object
+    '''
+    treeTableHeader = getTableHeader(["Item", "Kernel", "Whole list", "Transitions"])
+    writeTableStart(outputFile, treeTableHeader)
+
+    for itemIndex in range(table.numberOfItems()):
+        transitionsStrings = []
+        for symbol, destinationIndex in table.itemTransitions[itemIndex].items():
+            transitionsStrings.append(f"Under {symbol} moves to {destinationIndex}")
+
+        treeCellValues = [table.itemKernels[itemIndex],
+                          table.itemProductions[itemIndex],
+                          transitionsStrings]
+        outputFile.write(getTreeTableRow(itemIndex, treeCellValues))
+
+    writeTableEnd(outputFile)
+
+def writeParseProcess(outputFile, stringNumber, parseSteps):
+    '''
+    Writes the steps of a string's parse process as a table
+    with HTML format, preceded by a heading.
+    Arguments:
+        outputFile: a text file to write to
+        stringNumber: the number of the string, counting from 1
+        parseSteps: a list of steps, each one a list of cell values
+    '''
+    parseTableHeader = getTableHeader(["Stack", "String", "Action to perform"])
+    writeHtmlHeading(outputFile, f"Parse process for string #{stringNumber}")
+    writeTableStart(outputFile, parseTableHeader)
+    for parseStep in parseSteps:
+        outputFile.write(getTableRow(parseStep))
+    writeTableEnd(outputFile)
+    outputFile.write("\n")
@@ -0,0 +1,185 @@
+# Incremental parsing of edited strings, resuming from the state of
+# the previous parse where the edit begins
+
+from .grammar import EOF
+from .slr_table import ACCEPT_ACTION, EMPTY_GOTO, ERROR_ACTION
+
+def sameStacks(stackNode, otherStackNode):
+    '''
+    Checks if two stacks hold the same items. Stacks are linked nodes
+    that share their bottom, so they are only walked down to the first
+    node they share.
+    Arguments:
+        stackNode: the top node of a stack, a pair of item index and
+            the node below, None for the empty stack
+        otherStackNode: the top node of the other stack
+    Returns:
+        True if the stacks hold the same items
+    '''
+    while stackNode is not otherStackNode:
+        if stackNode is None or otherStackNode is None or stackNode[0] != otherStackNode[0]:
+            return False
+        stackNode = stackNode[1]
+        otherStackNode = otherStackNode[1]
+    return True
+
+class IncrementalParser:
+    '''
+    Recognizes a string and then the versions of it produced by edits,
+    each one replacing a range of its tokens, without parsing the whole
+    string again.
+    The item stack is a linked list of (item index, node below) pairs,
+    so a snapshot of it is kept at every token boundary without copying
+    it: the snapshot at boundary i is the stack right after shifting the
+    first i tokens, which doesn't depend on the rest of the string.
+    An edit resumes parsing from the snapshot where it begins, and once
+    past the edit, as soon as the stack at a boundary is the same as the
+    one at the matching boundary of the previous parse, the rest of the
+    previous parse is reused, so the tokens parsed again depend on the
+    size of the edit and not on the size of the string; only the lists
+    of tokens and snapshots are spliced.
+    A parse that fails has no snapshots past the error, so the parse
+    that is rejoined is the last one that reached the end of the string,
+    the reference: edits made since then are tracked as the index where
+    the tokens stop differing from it and the change in their number.
+    '''
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.tokens = []
+        self.snapshots = []
+        self.result = None
+        self.reparsedTokens = 0
+
+        self.referenceSnapshots = None
+        self.referenceResult = None
+        # Index after the last token edited since the reference parse,
+        # and the change in the number of tokens made by those edits
+        self.referenceEnd = 0
+        self.referenceDelta = 0
+
+    def parse(self, tokens):
+        '''
+        Recognizes a whole string, keeping its snapshots for later edits.
+        Arguments:
+            tokens: an iterable of tokens, without the end of file token
+        Returns:
+            a list with two elements like the result of SLRParser.recognize:
+            the position of the token where the parsing failed, counting
+            from 1, and an error message; both are None if the string is accepted
+        '''
+        self.tokens = list(tokens)
+        self.snapshots = [(0, None)]
+        self.referenceSnapshots = None
+        self.result = self.parseFrom(0)
+        self.keepCompleteParse()
+        return self.result
+
+    def keepCompleteParse(self):
+        '''
+        Makes the last parse the reference for later edits if it reached
+        the end of the string, which leaves a snapshot at every boundary.
+        '''
+        if len(self.snapshots) == len(self.tokens) + 1:
+            self.referenceSnapshots = self.snapshots
+            self.referenceResult = self.result
+            self.referenceEnd = 0
+            self.referenceDelta = 0
+
+    def edit(self, start, end, newTokens):
+        '''
+        Replaces the tokens from index start up to index end, not
+        included, and recognizes the edited string.
+        Arguments:
+            start: the index of the first replaced token
+            end: the index after the last replaced token
+            newTokens: an iterable with the tokens that take their place
+        Returns:
+            a list with two elements like the result of parse
+        '''
+        if not 0 <= start <= end <= len(self.tokens):
+            raise IndexError(f"Edit range [{start}, {end}) is outside of the {len(self.tokens)} tokens.")
+        newTokens = list(newTokens)
+        self.tokens[start:end] = newTokens
+        delta = len(newTokens) - (end - start)
+        self.referenceEnd = max(self.referenceEnd, end) + delta
+        self.referenceDelta += delta
+
+        # There are no snapshots past the token where the last parse failed
+        start = min(start, len(self.snapshots) - 1)
+        self.snapshots = self.snapshots[:start + 1]
+        self.result = self.parseFrom(start)
+        self.keepCompleteParse()
+        return self.result
+
+    def parseFrom(self, boundary):
+        '''
+        Parses from the snapshot at a token boundary to the end of the
+        string, appending the snapshots of the following boundaries, or
+        until the stack is the same as the one of the reference parse.
+        Arguments:
+            boundary: the index of the first token to read
+        Returns:
+            a list with two elements like the result of parse
+        '''
+        packedTables = self.parser.getPackedTables(not self.parser.keepUnitReductions)
+        terminalColumns = packedTables.terminalColumns
+        getAction = packedTables.getAction
+        getGoto = packedTables.getGoto
+        productionLengths = packedTables.productionLengths
+        productionGotoColumns = packedTables.productionGotoColumns
+
+        tokens = self.tokens
+        snapshots = self.snapshots
+        stackNode = snapshots[boundary]
+        referenceSnapshots = self.referenceSnapshots
+        self.reparsedTokens = 0
+
+        while True:
+            # Reuse the reference parse once the stack matches it again
+            if referenceSnapshots is not None and boundary >= self.referenceEnd:
+                referenceBoundary = boundary - self.referenceDelta
+                if referenceBoundary < len(referenceSnapshots) and \
+                        sameStacks(stackNode, referenceSnapshots[referenceBoundary]):
+                    snapshots.extend(referenceSnapshots[referenceBoundary + 1:])
+                    errorPosition, errorMessage = self.referenceResult
+                    if errorPosition is None:
+                        return (None, None)
+                    return (errorPosition + self.referenceDelta, errorMessage)
+
+            stringToken = tokens[boundary] if boundary < len(tokens) else EOF
+            if stringToken not in terminalColumns:
+                return (boundary + 1, f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar.")
+
+            # Reduce until the token is shifted
+            while True:
+                itemIndex = stackNode[0]
+                action = getAction(itemIndex, terminalColumns[stringToken])
+
+                if action > 0:
+                    stackNode = (action - 1, stackNode)
+                    break
+
+                elif action == ACCEPT_ACTION:
+                    return (None, None)
+
+                elif action == ERROR_ACTION:
+                    return (boundary + 1, f"Error: a required table value ({itemIndex}, \"{stringToken}\"), doesn't exist.")
+
+                else:
+                    productionIndex = -action - 1
+                    for i in range(productionLengths[productionIndex]):
+                        stackNode = stackNode[1]
+
+                    topIndex = stackNode[0]
+                    destinationIndex = getGoto(topIndex, productionGotoColumns[productionIndex])
+                    if destinationIndex == EMPTY_GOTO:
+                        productionHeader = packedTables.productionHeaders[productionIndex]
+                        return (boundary + 1, f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist.")
+                    stackNode = (destinationIndex, stackNode)
+
+            if boundary == len(tokens):
+                return (boundary + 2, "Error: tried to remove a token from the input string but it was empty.")
+            boundary += 1
+            snapshots.append(stackNode)
+            self.reparsedTokens += 1
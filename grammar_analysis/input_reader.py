@@ -0,0 +1,70 @@
+# Lazy reading of the input files of the scripts: a grammar's productions
+# followed by the strings to parse, without loading the whole file
+
+import io
+import mmap
+import os
+import stat
+from itertools import islice
+
+# Bytes of a memory-mapped file read between releases of its pages
+RELEASE_INTERVAL = 16 * 1024 * 1024
+
+def readLines(inputFile):
+    '''
+    Yields the lines of a file one at a time, without their line break.
+    Regular files are memory-mapped and lines are decoded as they are
+    read; the pages already read are released every RELEASE_INTERVAL
+    bytes, so memory use stays flat however large the file is. Pipes
+    and other streams are read line by line.
+    Arguments:
+        inputFile: an open text file, like sys.stdin
+    Returns:
+        a generator of strings
+    '''
+    try:
+        fileDescriptor = inputFile.fileno()
+        fileStatus = os.fstat(fileDescriptor)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileStatus = None
+
+    if fileStatus is None or not stat.S_ISREG(fileStatus.st_mode) or fileStatus.st_size == 0:
+        for line in inputFile:
+            yield line[:-1] if line.endswith("\n") else line
+        return
+
+    encoding = getattr(inputFile, "encoding", None) or "utf-8"
+    startPosition = os.lseek(fileDescriptor, 0, os.SEEK_CUR)
+    with mmap.mmap(fileDescriptor, 0, access=mmap.ACCESS_READ) as mappedFile:
+        mappedFile.seek(startPosition)
+        releasedPosition = 0
+        nextRelease = startPosition + RELEASE_INTERVAL
+        for line in iter(mappedFile.readline, b""):
+            if line.endswith(b"\n"):
+                line = line[:-1]
+            yield line.decode(encoding)
+
+            if mappedFile.tell() >= nextRelease and hasattr(mappedFile, "madvise"):
+                releaseEnd = mappedFile.tell() - mappedFile.tell() % mmap.PAGESIZE
+                mappedFile.madvise(mmap.MADV_DONTNEED, releasedPosition, releaseEnd - releasedPosition)
+                releasedPosition = releaseEnd
+                nextRelease = releaseEnd + RELEASE_INTERVAL
+
+def readParseInput(inputFile):
+    '''
+    Reads the beginning of a parse input: a line with the number of
+    productions and the number of strings, and the productions.
+    The strings are left to be read lazily.
+    Arguments:
+        inputFile: an open text file, like sys.stdin
+    Returns:
+        a list with two elements: the lines of the productions and an
+        iterator of the lines of the strings, as many as the first line says
+    '''
+    lines = readLines(inputFile)
+    inputNumbers = next(lines).strip().split()
+    numberOfProductions = int(inputNumbers[0])
+    numberOfStrings = int(inputNumbers[1])
+
+    productionLines = list(islice(lines, numberOfProductions))
+    return (productionLines, islice(lines, numberOfStrings))
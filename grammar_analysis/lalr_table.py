@@ -0,0 +1,131 @@
+# LALR(1) analysis table of a grammar: the LR(0) item tree of the SLR
+# table with lookaheads found by DeRemer and Pennello's relations
+
+from .first_follow import bitsetMembers, propagateSeeds
+from .grammar import EOF, EPSILON, body, header
+from .slr_table import SLRTable
+
+class LALRTable(SLRTable):
+    '''
+    The LALR(1) analysis table of a grammar. It shares the item tree
+    of the SLR table, but reductions are placed under the lookaheads of
+    each item instead of the follows of the production's header.
+    Lookaheads are the follows of the non-terminal transitions the item
+    looks back to, found by propagating sets through the "reads" and
+    "includes" relations, one strongly connected component at a time.
+    '''
+    TABLE_TYPE = "LALR"
+
+    def storeReduceActions(self):
+        '''
+        Stores the reduce and accept actions of the completed productions,
+        finding the lookaheads of every item first.
+        '''
+        self.calculateLookaheads()
+        super().storeReduceActions()
+
+    def reduceLookaheads(self, itemIndex, productionWithDot):
+        '''
+        Returns the terminals under which a completed production
+        is reduced: its lookaheads in the item.
+        Arguments:
+            itemIndex: the index of the item with the production
+            productionWithDot: a completed production with dot
+        Returns:
+            a list of terminals
+        '''
+        lookaheads = self.lookaheads.get((itemIndex, productionWithDot.productionId), 0)
+        return bitsetMembers(lookaheads, self.firstFollow.bitTerminals)
+
+    def calculateLookaheads(self):
+        '''
+        Finds the lookaheads of the completed productions of every item.
+        A non-terminal transition is a pair of an item and a non-terminal
+        it has a transition under, its follows are the terminals that
+        can come after the non-terminal when it is reduced in that item.
+        '''
+        grammar = self.grammar
+        firstFollow = self.firstFollow
+        terminalBits = firstFollow.terminalBits
+        nullableNonTerms = set()
+        for nonTerminal in grammar.nonTerminals:
+            if firstFollow.firsts[nonTerminal] & firstFollow.epsilonBit:
+                nullableNonTerms.add(nonTerminal)
+
+        # Find the non-terminal transitions
+        nonTermTransitions = []
+        for itemIndex in range(self.numberOfItems()):
+            for symbol in self.itemTransitions[itemIndex].keys():
+                if symbol in grammar.nonTerminals:
+                    nonTermTransitions.append((itemIndex, symbol))
+
+        # Directly read terminals are the seeds of the reads relation,
+        # a transition reads the ones after the nullable non-terminals
+        # its destination has transitions under
+        directReads = dict()
+        reverseReads = dict()
+        for transition in nonTermTransitions:
+            directReads[transition] = 0
+            reverseReads[transition] = set()
+
+        for transition in nonTermTransitions:
+            itemIndex, nonTerminal = transition
+            destinationIndex = self.itemTransitions[itemIndex][nonTerminal]
+            for symbol in self.itemTransitions[destinationIndex].keys():
+                if symbol in grammar.terminals:
+                    directReads[transition] |= terminalBits[symbol]
+                elif symbol in nullableNonTerms:
+                    reverseReads[(destinationIndex, symbol)].add(transition)
+
+            # The end of file comes after the start non-terminal in item 0
+            if itemIndex == 0 and nonTerminal == grammar.startNonTerm:
+                directReads[transition] |= terminalBits[EOF]
+
+        reads = dict.fromkeys(nonTermTransitions, 0)
+        propagateSeeds(directReads, reverseReads, reads)
+
+        # Walk each production of a transition's non-terminal from its item,
+        # non-terminals followed by a nullable suffix include the transition,
+        # and the item where the walk ends looks back to it
+        productionsOf = dict()
+        for nonTerminal in grammar.nonTerminals:
+            productionsOf[nonTerminal] = []
+        for productionId in range(1, len(grammar.augmentedProductions)):
+            production = grammar.augmentedProductions[productionId]
+            productionSymbols = [token for token in body(production) if token != EPSILON]
+
+            # Index where the production's nullable suffix starts
+            nullableStart = len(productionSymbols)
+            while nullableStart > 0 and productionSymbols[nullableStart - 1] in nullableNonTerms:
+                nullableStart -= 1
+            productionsOf[header(production)].append((productionId, productionSymbols, nullableStart))
+
+        reverseIncludes = dict()
+        for transition in nonTermTransitions:
+            reverseIncludes[transition] = set()
+
+        lookbacks = dict()
+        for transition in nonTermTransitions:
+            itemIndex, nonTerminal = transition
+            for productionId, productionSymbols, nullableStart in productionsOf[nonTerminal]:
+                currentIndex = itemIndex
+                for i in range(len(productionSymbols)):
+                    symbol = productionSymbols[i]
+                    if symbol in grammar.nonTerminals and i + 1 >= nullableStart:
+                        reverseIncludes[transition].add((currentIndex, symbol))
+                    currentIndex = self.itemTransitions[currentIndex][symbol]
+
+                lookbackKey = (currentIndex, productionId)
+                if lookbackKey not in lookbacks:
+                    lookbacks[lookbackKey] = []
+                lookbacks[lookbackKey].append(transition)
+
+        transitionFollows = dict.fromkeys(nonTermTransitions, 0)
+        propagateSeeds(reads, reverseIncludes, transitionFollows)
+
+        self.lookaheads = dict()
+        for lookbackKey, transitions in lookbacks.items():
+            lookaheads = 0
+            for transition in transitions:
+                lookaheads |= transitionFollows[transition]
+            self.lookaheads[lookbackKey] = lookaheads
@@ -0,0 +1,141 @@
+# Lexical analysis of raw text into the terminals of a grammar, with
+# token definitions compiled into a single regular expression
+
+import re
+
+# Terminal name of the definitions whose matches are discarded
+SKIP = "%skip"
+
+# Whitespace between tokens, skipped by default
+DEFAULT_SKIP_PATTERN = r"\s+"
+
+class LexingError(Exception):
+    '''
+    Raised while lexing a text when no token definition matches it,
+    its argument is the error message.
+    '''
+
+class Lexer:
+    '''
+    Splits raw text into tokens described by regular expressions. The
+    definitions are compiled into one alternation of named groups, so a
+    text is scanned in a single pass of the regular expression engine.
+    Definitions are tried in order and the first one that matches wins,
+    so keywords must come before identifiers and longer operators
+    before their prefixes. Definitions are (terminal, pattern) pairs,
+    and the text matched by the skip patterns is discarded.
+    '''
+
+    def __init__(self, definitions, skipPatterns = (DEFAULT_SKIP_PATTERN,)):
+        self.definitions = list(definitions)
+        self.skipPatterns = list(skipPatterns)
+        for terminal, pattern in self.definitions + [(SKIP, pattern) for pattern in self.skipPatterns]:
+            if re.compile(pattern).fullmatch("") is not None:
+                raise ValueError(f"Token pattern matches the empty string: \"{pattern}\".")
+
+        # Group names must be identifiers, so groups are numbered
+        # and mapped back to their terminal
+        self.groupTerminals = dict()
+        groups = []
+        for terminal, pattern in self.definitions:
+            groupName = f"t{len(self.groupTerminals)}"
+            self.groupTerminals[groupName] = terminal
+            groups.append(f"(?P<{groupName}>{pattern})")
+
+        # Any other character is an error, matched so scanning never stops early
+        self.errorGroup = f"t{len(self.groupTerminals)}"
+        groups.append(f"(?P<{self.errorGroup}>.)")
+
+        # Every match takes the skipped text before a token along with it,
+        # the text skipped at the end is a match without a token
+        skippedText = "|".join(f"(?:{pattern})" for pattern in self.skipPatterns)
+        self.regex = re.compile(f"(?:{skippedText})*(?:{'|'.join(groups)}|\\Z)", re.DOTALL)
+
+    @classmethod
+    def fromLines(cls, lines):
+        '''
+        Creates a lexer from lines with a terminal and its pattern,
+        separated by whitespace, like "number [0-9]+". The terminal
+        "%skip" discards the text its pattern matches, and lines that are
+        empty or start with "#" are ignored. If there are no "%skip"
+        lines, whitespace is skipped.
+        Arguments:
+            lines: an iterable of strings
+        Returns:
+            a Lexer object
+        '''
+        definitions = []
+        skipPatterns = []
+        for line in lines:
+            line = line.strip()
+            if line == "" or line.startswith("#"):
+                continue
+            parts = line.split(maxsplit=1)
+            if len(parts) != 2:
+                raise ValueError(f"Token definition without a pattern: \"{line}\".")
+            terminal, pattern = parts
+            if terminal == SKIP:
+                skipPatterns.append(pattern)
+            else:
+                definitions.append((terminal, pattern))
+        if len(skipPatterns) == 0:
+            skipPatterns.append(DEFAULT_SKIP_PATTERN)
+        return cls(definitions, skipPatterns)
+
+    @classmethod
+    def fromGrammar(cls, grammar):
+        '''
+        Creates a lexer that matches the terminals of a grammar literally,
+        the longest ones first, skipping whitespace. Terminals don't need
+        to be separated, so "ab" is split into "a" and "b".
+        Arguments:
+            grammar: a Grammar object
+        Returns:
+            a Lexer object
+        '''
+        terminals = sorted(grammar.terminals, key=lambda terminal: (-len(terminal), terminal))
+        return cls([(terminal, re.escape(terminal)) for terminal in terminals])
+
+    def tokenize(self, text):
+        '''
+        Scans a text, yielding its tokens as they are found.
+        Arguments:
+            text: a string
+        Returns:
+            a generator of (terminal, lexeme, position) tuples, where the
+            position is the index of the lexeme's first character in the text
+        '''
+        groupTerminals = self.groupTerminals
+        for match in self.regex.finditer(text):
+            groupName = match.lastgroup
+            if groupName in groupTerminals:
+                yield (groupTerminals[groupName], match.group(groupName), match.start(groupName))
+            elif groupName is not None:
+                self.raiseLexingError(match)
+
+    def terminals(self, text):
+        '''
+        Scans a text like tokenize, yielding only the terminals
+        of its tokens, as the parsers expect them.
+        Arguments:
+            text: a string
+        Returns:
+            a generator of terminals
+        '''
+        groupTerminals = self.groupTerminals
+        for match in self.regex.finditer(text):
+            groupName = match.lastgroup
+            if groupName in groupTerminals:
+                yield groupTerminals[groupName]
+            elif groupName is not None:
+                self.raiseLexingError(match)
+
+    def raiseLexingError(self, match):
+        '''
+        Raises the LexingError of a character no token definition matches.
+        Arguments:
+            match: the match of the character in the error group
+        '''
+        position = match.start(self.errorGroup)
+        raise LexingError(f"Error: no token matches the text at character {position + 1} "
+                          f"(\"{match.group(self.errorGroup)}\").")
@@ -0,0 +1,258 @@
+# LR(1) analysis table of a grammar, with items that carry lookaheads
+# and Pager's weak compatibility test to merge items with the same core
+
+from .first_follow import bitsetMembers
+from .grammar import BODY_START_INDEX, EOF
+from .slr_table import ProductionWithDot, Queue, SLRTable
+
+class LR1Table(SLRTable):
+    '''
+    The LR(1) analysis table of a grammar. Every production with dot of
+    an item's kernel carries a bitset of lookaheads, and reductions are
+    placed under the lookaheads of the completed productions.
+    Items with the same kernel productions (their core) are merged when
+    their lookaheads are weakly compatible, as proposed by Pager, so the
+    table keeps the LR(1) power with a number of items close to LALR(1).
+    '''
+    TABLE_TYPE = "LR1"
+    MERGE_COMPATIBLE_ITEMS = True
+
+    def reduceLookaheads(self, itemIndex, productionWithDot):
+        '''
+        Returns the terminals under which a completed production
+        is reduced: its lookaheads in the item.
+        Arguments:
+            itemIndex: the index of the item with the production
+            productionWithDot: a completed production with dot
+        Returns:
+            a list of terminals
+        '''
+        lookaheads = self.itemLookaheads[itemIndex][productionWithDot.productionId]
+        return bitsetMembers(lookaheads, self.firstFollow.bitTerminals)
+
+    def weaklyCompatible(self, lookaheads, otherLookaheads):
+        '''
+        Checks if two items with the same core can be merged without
+        adding conflicts that the items don't already have: for any two
+        productions of the core, merging mixes their lookaheads only if
+        they already shared lookaheads in one of the items.
+        Arguments:
+            lookaheads: a list with the lookaheads bitset of each kernel production
+            otherLookaheads: the lookaheads of the other item, in the same order
+        Returns:
+            True if the items can be merged
+        '''
+        if lookaheads == otherLookaheads:
+            return True
+        if not self.MERGE_COMPATIBLE_ITEMS:
+            return False
+
+        for i in range(len(lookaheads)):
+            for j in range(i + 1, len(lookaheads)):
+                if not (lookaheads[i] & otherLookaheads[j] or otherLookaheads[i] & lookaheads[j]):
+                    continue
+                if not (lookaheads[i] & lookaheads[j] or otherLookaheads[i] & otherLookaheads[j]):
+                    return False
+        return True
+
+    def getClosureLookaheads(self, kernel, kernelLookaheads, initialEdges, restFirsts):
+        '''
+        Finds the lookaheads of the non-terminals expected in an item: the
+        firsts of what follows them in the productions that expect them,
+        and the lookaheads of those productions if that can be empty.
+        Arguments:
+            kernel: a list of productions with dot
+            kernelLookaheads: a list with the lookaheads bitset of each kernel production
+            initialEdges: a dictionary with the pairs of expected non-terminal id
+                and firsts of the rest of the body of each non-terminal's productions
+            restFirsts: a function returning the firsts of the symbols after
+                the expected non-terminal of a production with dot
+        Returns:
+            a dictionary with the lookaheads bitset of each expected non-terminal id
+        '''
+        epsilonBit = self.firstFollow.epsilonBit
+        lookaheadsOf = dict()
+        worklist = []
+
+        def addLookaheads(nonTerminalId, lookaheads):
+            previousLookaheads = lookaheadsOf.get(nonTerminalId)
+            if previousLookaheads is None or lookaheads & ~previousLookaheads:
+                lookaheadsOf[nonTerminalId] = (previousLookaheads or 0) | lookaheads
+                worklist.append(nonTerminalId)
+
+        for productionWithDot, lookaheads in zip(kernel, kernelLookaheads):
+            underlinedSymbol = productionWithDot.underlined()
+            if underlinedSymbol in self.grammar.nonTerminalIds:
+                firsts = restFirsts(productionWithDot)
+                addLookaheads(underlinedSymbol, (firsts & ~epsilonBit) | (lookaheads if firsts & epsilonBit else 0))
+
+        while len(worklist) > 0:
+            nonTerminalId = worklist.pop()
+            for expectedNonTerm, firsts in initialEdges[nonTerminalId]:
+                addLookaheads(expectedNonTerm, (firsts & ~epsilonBit) |
+                              (lookaheadsOf[nonTerminalId] if firsts & epsilonBit else 0))
+        return lookaheadsOf
+
+    def buildItemTree(self):
+        '''
+        Builds the LR(1) item tree with a breath first traversal,
+        starting from the item with the artificial production.
+        An item is traversed again whenever merging adds lookaheads to it,
+        so that they reach the items it has transitions to.
+        '''
+        grammar = self.grammar
+        firstFollow = self.firstFollow
+        closuresOf = self.getClosures()
+        closureCache = dict()
+
+        # Firsts of the symbols after the underlined one of each production with dot
+        restFirstsCache = dict()
+        def restFirsts(productionWithDot):
+            if productionWithDot.key not in restFirstsCache:
+                production = productionWithDot.getProduction()
+                restIndex = BODY_START_INDEX + productionWithDot.dotIndex + 1
+                restFirstsCache[productionWithDot.key] = firstFollow.firstsOfString(production, restIndex)
+            return restFirstsCache[productionWithDot.key]
+
+        initialEdges = dict()
+        for nonTerminalId in grammar.nonTerminalIds:
+            initialEdges[nonTerminalId] = []
+        for productionId in range(1, len(grammar.augmentedProductions)):
+            productionWithDot = ProductionWithDot(grammar, productionId)
+            underlinedSymbol = productionWithDot.underlined()
+            if underlinedSymbol in grammar.nonTerminalIds:
+                initialEdges[grammar.productionHeaders[productionId]].append(
+                    (underlinedSymbol, restFirsts(productionWithDot)))
+
+        # Lookaheads of the kernel productions of each item, in kernel order
+        kernelLookaheads = []
+        # Indices of the items with each core, keyed by the frozen kernel
+        coreIndices = dict()
+        itemQueue = Queue()
+        queuedItems = set()
+
+        def insertItem(kernel, lookaheads):
+            self.itemKernels.append(kernel)
+            kernelLookaheads.append(lookaheads)
+            self.itemProductions.append(None)
+            self.itemTransitions.append(dict())
+            self.itemLookaheads.append(None)
+            newItemIndex = len(self.itemKernels) - 1
+            frozenKernel = frozenset(kernel)
+            if frozenKernel not in coreIndices:
+                coreIndices[frozenKernel] = []
+            coreIndices[frozenKernel].append(newItemIndex)
+            itemQueue.insert(newItemIndex)
+            queuedItems.add(newItemIndex)
+            return newItemIndex
+
+        self.itemLookaheads = []
+        insertItem([ProductionWithDot(grammar, 0)], [firstFollow.terminalBits[EOF]])
+
+        while not itemQueue.empty():
+            itemIndex = itemQueue.remove()
+            queuedItems.discard(itemIndex)
+            kernel = self.itemKernels[itemIndex]
+            lookaheads = kernelLookaheads[itemIndex]
+
+            closure = self.getKernelClosure(kernel, closuresOf, closureCache)
+            closureLookaheads = self.getClosureLookaheads(kernel, lookaheads, initialEdges, restFirsts)
+            self.itemProductions[itemIndex] = kernel + closure
+
+            # Lookaheads of every production with dot of the item
+            productionLookaheads = dict(zip(kernel, lookaheads))
+            for productionWithDot in closure:
+                header = grammar.productionHeaders[productionWithDot.productionId]
+                productionLookaheads[productionWithDot] = closureLookaheads.get(header, 0)
+
+            completedLookaheads = dict()
+            for productionWithDot, productionLookahead in productionLookaheads.items():
+                if productionWithDot.completed():
+                    completedLookaheads[productionWithDot.productionId] = productionLookahead
+            self.itemLookaheads[itemIndex] = completedLookaheads
+
+            # Bucket the advanced productions by the symbol they are derived under
+            derivedKernels = dict()
+            for productionWithDot, productionLookahead in productionLookaheads.items():
+                underlinedSymbol = productionWithDot.underlined()
+                if underlinedSymbol is None:
+                    continue
+                if underlinedSymbol not in derivedKernels:
+                    derivedKernels[underlinedSymbol] = dict()
+                derivedKernels[underlinedSymbol][productionWithDot.advanceDot()] = productionLookahead
+
+            # Derive for each terminal and non-terminal
+            self.itemTransitions[itemIndex] = dict()
+            for symbol in grammar.symbols:
+                symbolId = grammar.symbolIds[symbol]
+                if symbolId not in derivedKernels:
+                    continue
+                derivedKernel = sorted(derivedKernels[symbolId], key=lambda item: item.key)
+                derivedLookaheads = [derivedKernels[symbolId][item] for item in derivedKernel]
+
+                destinationIndex = None
+                for candidateIndex in coreIndices.get(frozenset(derivedKernel), []):
+                    candidateLookaheads = kernelLookaheads[candidateIndex]
+                    if not self.weaklyCompatible(candidateLookaheads, derivedLookaheads):
+                        continue
+
+                    # Merge into the compatible item, traversing it again if it grew
+                    destinationIndex = candidateIndex
+                    mergedLookaheads = [a | b for a, b in zip(candidateLookaheads, derivedLookaheads)]
+                    if mergedLookaheads != candidateLookaheads:
+                        kernelLookaheads[candidateIndex] = mergedLookaheads
+                        if candidateIndex not in queuedItems:
+                            itemQueue.insert(candidateIndex)
+                            queuedItems.add(candidateIndex)
+                    break
+
+                if destinationIndex is None:
+                    destinationIndex = insertItem(derivedKernel, derivedLookaheads)
+
+                # Store transitions between items
+                self.itemTransitions[itemIndex][symbol] = destinationIndex
+
+        self.removeUnreachableItems()
+
+    def removeUnreachableItems(self):
+        '''
+        Removes the items that can no longer be reached from item 0,
+        which happens when an item grows while being merged and one of
+        its transitions moves to a different item, and renumbers the rest.
+        '''
+        newIndices = {0: 0}
+        reachedItems = [0]
+        i = 0
+        while i < len(reachedItems):
+            for destinationIndex in self.itemTransitions[reachedItems[i]].values():
+                if destinationIndex not in newIndices:
+                    newIndices[destinationIndex] = len(reachedItems)
+                    reachedItems.append(destinationIndex)
+            i += 1
+
+        if len(reachedItems) == self.numberOfItems():
+            return
+
+        reachedItems.sort()
+        for newIndex in range(len(reachedItems)):
+            newIndices[reachedItems[newIndex]] = newIndex
+
+        self.itemKernels = [self.itemKernels[itemIndex] for itemIndex in reachedItems]
+        self.itemProductions = [self.itemProductions[itemIndex] for itemIndex in reachedItems]
+        self.itemLookaheads = [self.itemLookaheads[itemIndex] for itemIndex in reachedItems]
+        itemTransitions = []
+        for itemIndex in reachedItems:
+            transitions = dict()
+            for symbol, destinationIndex in self.itemTransitions[itemIndex].items():
+                transitions[symbol] = newIndices[destinationIndex]
+            itemTransitions.append(transitions)
+        self.itemTransitions = itemTransitions
+
+class CanonicalLR1Table(LR1Table):
+    '''
+    The canonical LR(1) analysis table of a grammar: items are only
+    merged when their lookaheads are identical, which can make it
+    many times larger than the LR(1) table with merged items.
+    '''
+    TABLE_TYPE = "CanonicalLR1"
+    MERGE_COMPATIBLE_ITEMS = False
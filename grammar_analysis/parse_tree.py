@@ -0,0 +1,160 @@
+# Parse trees stored in flat integer arrays, one entry per node,
+# so that large inputs don't need an object for every node
+
+from array import array
+
+class ParseTree:
+    '''
+    The parse tree of a string, stored as an arena: inner nodes are
+    indices into parallel arrays with their production id, the position
+    of their first child in the children array, their number of children
+    and the span of tokens they cover, from the index of their first
+    token to the index after their last one.
+    Leaves are the tokens of the string: the leaf of the token at index
+    i is the negative node -(i + 1), and only the symbol id of each
+    token is stored. Inner nodes are added bottom-up, so children always
+    come before their parent and the root, the node of the start
+    symbol, is the last one.
+    '''
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.nodeProductions = array("i")
+        self.nodeFirstChildren = array("i")
+        self.nodeChildCounts = array("i")
+        self.nodeSpanStarts = array("i")
+        self.nodeSpanEnds = array("i")
+        self.children = array("i")
+        self.tokenSymbols = array("i")
+        self.root = None
+
+    def numberOfNodes(self):
+        '''
+        Returns the number of nodes of the tree, leaves included.
+        '''
+        return len(self.nodeProductions) + len(self.tokenSymbols)
+
+    def addLeaf(self, terminal):
+        '''
+        Adds the leaf of the next token of the string.
+        Arguments:
+            terminal: the terminal of the token
+        Returns:
+            the leaf node
+        '''
+        self.tokenSymbols.append(self.grammar.symbolIds[terminal])
+        return -len(self.tokenSymbols)
+
+    def addNode(self, productionId, childNodes):
+        '''
+        Adds the node of a reduction. A node without children has an
+        empty span at the token after the ones read so far.
+        Arguments:
+            productionId: the id of the reduced production
+            childNodes: a sequence with the nodes of the production's body, in order
+        Returns:
+            the new node
+        '''
+        self.nodeProductions.append(productionId)
+        self.nodeFirstChildren.append(len(self.children))
+        self.nodeChildCounts.append(len(childNodes))
+        if len(childNodes) > 0:
+            self.nodeSpanStarts.append(self.getSpan(childNodes[0])[0])
+            self.nodeSpanEnds.append(self.getSpan(childNodes[-1])[1])
+        else:
+            self.nodeSpanStarts.append(len(self.tokenSymbols))
+            self.nodeSpanEnds.append(len(self.tokenSymbols))
+        self.children.extend(childNodes)
+        return len(self.nodeProductions) - 1
+
+    def isLeaf(self, node):
+        '''
+        Checks if a node is the leaf of a token.
+        '''
+        return node < 0
+
+    def getProductionId(self, node):
+        '''
+        Returns the id of the production a node was reduced by,
+        None for leaves.
+        '''
+        if node < 0:
+            return None
+        return self.nodeProductions[node]
+
+    def getSymbol(self, node):
+        '''
+        Returns the name of the symbol of a node: the header of its
+        production, or the terminal of a leaf.
+        '''
+        if node < 0:
+            return self.grammar.symbolNames[self.tokenSymbols[-node - 1]]
+        return self.grammar.symbolNames[self.grammar.productionHeaders[self.nodeProductions[node]]]
+
+    def getChildren(self, node):
+        '''
+        Returns the children of a node, in order, as an array of nodes.
+        '''
+        if node < 0:
+            return array("i")
+        firstChild = self.nodeFirstChildren[node]
+        return self.children[firstChild:firstChild + self.nodeChildCounts[node]]
+
+    def getSpan(self, node):
+        '''
+        Returns the span of tokens of a node, as a list with the index of
+        its first token and the index after its last one.
+        '''
+        if node < 0:
+            return (-node - 1, -node)
+        return (self.nodeSpanStarts[node], self.nodeSpanEnds[node])
+
+    def walk(self, node = None):
+        '''
+        Visits the nodes of a subtree in preorder, without recursion,
+        so trees of any depth can be walked.
+        Arguments:
+            node: the root of the subtree, the root of the tree by default
+        Returns:
+            a generator of nodes
+        '''
+        if node is None:
+            node = self.root
+        pendingNodes = [node]
+        while len(pendingNodes) > 0:
+            node = pendingNodes.pop()
+            yield node
+            pendingNodes.extend(reversed(self.getChildren(node)))
+
+    def toSExpression(self, lexemes = None):
+        '''
+        Serializes the tree as nested parenthesized lists, like
+        "(E (T (F id)))", where inner nodes start with their symbol.
+        Arguments:
+            lexemes: a sequence with the text of each token of the string,
+                the leaves are written as their terminals if it is None
+        Returns:
+            a string
+        '''
+        parts = []
+        # Nodes to write, closing parentheses are pending entries of None
+        pendingNodes = [self.root]
+        while len(pendingNodes) > 0:
+            node = pendingNodes.pop()
+            if node is None:
+                parts.append(")")
+                continue
+            if node != self.root:
+                parts.append(" ")
+            if node < 0:
+                if lexemes is None:
+                    parts.append(self.getSymbol(node))
+                else:
+                    parts.append(lexemes[-node - 1])
+                continue
+
+            parts.append("(")
+            parts.append(self.getSymbol(node))
+            pendingNodes.append(None)
+            pendingNodes.extend(reversed(self.getChildren(node)))
+        return "".join(parts)
@@ -0,0 +1,128 @@
+# Push parsing of tokens that arrive a few at a time, like the ones
+# read from a socket, without waiting for the whole string
+
+from .grammar import EOF
+from .slr_table import ACCEPT_ACTION, EMPTY_GOTO, ERROR_ACTION
+
+class PushParser:
+    '''
+    Recognizes a string whose tokens are pushed into it one by one, and
+    only keeps the item stack between them. Each token is parsed as soon
+    as it is fed, so an error is found at the token that causes it, and
+    the end of the string is marked by calling finish.
+    Results are the ones of SLRParser.recognize: a list with the position
+    of the token where the parsing failed, counting from 1, and an
+    error message, both None if the string is accepted.
+    '''
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.packedTables = parser.getPackedTables(not parser.keepUnitReductions)
+        self.reset()
+
+    def reset(self):
+        '''
+        Forgets the tokens fed so far, to recognize a new string.
+        '''
+        self.stack = [0]
+        self.position = 1
+        self.result = None
+
+    def feed(self, token):
+        '''
+        Parses the next token of the string.
+        Arguments:
+            token: a terminal of the grammar
+        Returns:
+            the result of the string if the token ended it with an error,
+            or if it had already ended, None otherwise
+        '''
+        if self.result is not None:
+            return self.result
+
+        packedTables = self.packedTables
+        terminalColumns = packedTables.terminalColumns
+        if token not in terminalColumns:
+            self.result = (self.position, f"Error: input string has a symbol (\"{token}\") that is not recognized by the grammar.")
+            return self.result
+
+        stack = self.stack
+        terminalColumn = terminalColumns[token]
+        while True:
+            itemIndex = stack[-1]
+            action = packedTables.getAction(itemIndex, terminalColumn)
+
+            if action > 0:
+                stack.append(action - 1)
+                self.position += 1
+                return None
+
+            elif action == ACCEPT_ACTION:
+                self.result = (None, None)
+                return self.result
+
+            elif action == ERROR_ACTION:
+                self.result = (self.position, f"Error: a required table value ({itemIndex}, \"{token}\"), doesn't exist.")
+                return self.result
+
+            else:
+                productionIndex = -action - 1
+                tokensToRemove = packedTables.productionLengths[productionIndex]
+                if tokensToRemove > 0:
+                    del stack[-tokensToRemove:]
+
+                topIndex = stack[-1]
+                destinationIndex = packedTables.getGoto(topIndex, packedTables.productionGotoColumns[productionIndex])
+                if destinationIndex == EMPTY_GOTO:
+                    productionHeader = packedTables.productionHeaders[productionIndex]
+                    self.result = (self.position, f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist.")
+                    return self.result
+                stack.append(destinationIndex)
+
+    def feedMany(self, tokens):
+        '''
+        Parses the next tokens of the string, stopping at the first error.
+        Arguments:
+            tokens: an iterable of terminals
+        Returns:
+            the result of the string if the tokens ended it with an error,
+            or if it had already ended, None otherwise
+        '''
+        for token in tokens:
+            result = self.feed(token)
+            if result is not None:
+                return result
+        return self.result
+
+    def finish(self):
+        '''
+        Marks the end of the string, parsing the end of file token.
+        Returns:
+            the result of the string
+        '''
+        result = self.feed(EOF)
+        if result is None:
+            self.result = (self.position, "Error: tried to remove a token from the input string but it was empty.")
+        return self.result
+
+async def recognizeAsync(parser, tokens):
+    '''
+    Recognizes a string whose tokens are read from an asynchronous
+    iterable, parsing each one as it arrives. Reading stops at the first
+    error, without waiting for the rest of the string.
+    Arguments:
+        parser: an SLRParser object
+        tokens: an asynchronous iterable of tokens, or of lists of
+            tokens for streams read in chunks, without the end of file token
+    Returns:
+        a list with two elements like the result of SLRParser.recognize
+    '''
+    pushParser = PushParser(parser)
+    async for tokenOrChunk in tokens:
+        if isinstance(tokenOrChunk, str):
+            result = pushParser.feed(tokenOrChunk)
+        else:
+            result = pushParser.feedMany(tokenOrChunk)
+        if result is not None:
+            return result
+    return pushParser.finish()
@@ -0,0 +1,77 @@
+# Semantic actions run on reductions, to evaluate or translate
+# strings while they are parsed
+
+from .grammar import header, parseProduction
+
+class SemanticActions:
+    '''
+    The callables a parser runs on each reduction of a grammar. An
+    action receives the values of the symbols of the production's body
+    as arguments, the lexemes of the tokens and the results of the
+    actions of the non-terminals, and returns the value of its header.
+    Actions are registered per production or per header non-terminal,
+    production actions taking priority. Productions without an action
+    take the value of their first symbol, or None if their body is empty.
+    '''
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.productionActions = dict()
+        self.nonTerminalActions = dict()
+
+    def getProductionId(self, production):
+        '''
+        Returns the id of a production of the grammar.
+        Arguments:
+            production: the id of the production, its index in the
+                augmented productions, or its text like "E -> E + T"
+        Returns:
+            the id of the production
+        '''
+        if isinstance(production, int):
+            if not 0 < production < len(self.grammar.augmentedProductions):
+                raise ValueError(f"Production {production} is not in the grammar.")
+            return production
+        tokens = parseProduction(production)
+        for productionId in range(1, len(self.grammar.augmentedProductions)):
+            if self.grammar.augmentedProductions[productionId] == tokens:
+                return productionId
+        raise ValueError(f"Production \"{production}\" is not in the grammar.")
+
+    def onProduction(self, production, action):
+        '''
+        Registers the action of a production.
+        Arguments:
+            production: the id of the production or its text
+            action: a callable
+        '''
+        self.productionActions[self.getProductionId(production)] = action
+
+    def onNonTerminal(self, nonTerminal, action):
+        '''
+        Registers the action of the productions of a non-terminal
+        that don't have an action of their own.
+        Arguments:
+            nonTerminal: the header of the productions
+            action: a callable
+        '''
+        if nonTerminal not in self.grammar.nonTerminals:
+            raise ValueError(f"Non-terminal \"{nonTerminal}\" is not in the grammar.")
+        self.nonTerminalActions[nonTerminal] = action
+
+    def getDispatchList(self):
+        '''
+        Returns the action of each production, so that a reduction
+        finds its action with a single index.
+        Returns:
+            a list indexed by production id with the callables,
+            None for the productions without an action
+        '''
+        dispatchList = [None]
+        for productionId in range(1, len(self.grammar.augmentedProductions)):
+            action = self.productionActions.get(productionId)
+            if action is None:
+                productionHeader = header(self.grammar.augmentedProductions[productionId])
+                action = self.nonTerminalActions.get(productionHeader)
+            dispatchList.append(action)
+        return dispatchList
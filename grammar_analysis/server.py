@@ -0,0 +1,262 @@
+# Parse server that keeps compiled grammars in memory, answering
+# requests of newline delimited JSON objects over TCP or a Unix socket
+
+import asyncio
+import json
+
+from .grammar import Grammar
+from .slr_parser import SLRParser
+from .slr_table import TableConflictError
+from .table_cache import loadOrBuildTable
+
+# Longest request line read from a client, in bytes
+REQUEST_LINE_LIMIT = 64 * 1024 * 1024
+
+class RequestError(Exception):
+    '''
+    Raised when a request can't be answered, its argument
+    is the error message sent back to the client.
+    '''
+
+def buildParser(grammar, cacheDir):
+    '''
+    Builds the parser of a grammar along with the compressed tables it
+    parses with, so that no table is built when strings are parsed.
+    Arguments:
+        grammar: a Grammar object
+        cacheDir: the directory of the cache, None to always build the table
+    Returns:
+        an SLRParser object
+    '''
+    table = loadOrBuildTable(grammar, cacheDir)
+    table.getCompressedTables(bypassUnitReductions=True)
+    return SLRParser(table, compressed=True)
+
+class GrammarRegistry:
+    '''
+    The compiled grammars known by the server, keyed by grammar hash.
+    Parsers hold no state between strings, so every client shares
+    the same read-only tables.
+    '''
+
+    def __init__(self, cacheDir = None):
+        self.cacheDir = cacheDir
+        self.parsers = dict()
+        self.pendingBuilds = dict()
+
+    async def register(self, lines):
+        '''
+        Compiles a grammar unless it was registered already, its tables
+        are built or loaded in a worker thread so that other requests are
+        not held back.
+        Concurrent registrations of the same grammar share a single build.
+        Arguments:
+            lines: a list of strings with one production each
+        Returns:
+            the hash of the grammar
+        '''
+        grammar = Grammar.fromLines(lines)
+        grammarHash = grammar.getHash()
+        if grammarHash in self.parsers:
+            return grammarHash
+
+        if grammarHash not in self.pendingBuilds:
+            build = asyncio.to_thread(buildParser, grammar, self.cacheDir)
+            self.pendingBuilds[grammarHash] = asyncio.ensure_future(build)
+
+        try:
+            self.parsers[grammarHash] = await self.pendingBuilds[grammarHash]
+        finally:
+            self.pendingBuilds.pop(grammarHash, None)
+        return grammarHash
+
+    def getParser(self, grammarHash):
+        '''
+        Returns the parser of a registered grammar.
+        Arguments:
+            grammarHash: the hash returned when the grammar was registered
+        Returns:
+            an SLRParser object
+        '''
+        if grammarHash not in self.parsers:
+            raise RequestError(f"Error: grammar \"{grammarHash}\" is not registered.")
+        return self.parsers[grammarHash]
+
+def getParseResult(errorPosition, errorMessage):
+    '''
+    Returns the result of parsing a string as a JSON compatible dictionary.
+    Arguments:
+        errorPosition: the position of the token where the parsing failed,
+            None if the string was accepted
+        errorMessage: the error message, None if the string was accepted
+    Returns:
+        a dictionary with the verdict and the error details
+    '''
+    if errorPosition is None:
+        return {"accepted": True}
+    return {"accepted": False, "position": errorPosition, "message": errorMessage}
+
+def isValidString(string):
+    '''
+    Checks if a string of a parse request is a string with tokens
+    separated by blanks or a list of tokens.
+    Arguments:
+        string: a decoded JSON value
+    Returns:
+        True if the string can be parsed
+    '''
+    if isinstance(string, str):
+        return True
+    return isinstance(string, list) and all(isinstance(token, str) for token in string)
+
+def recognizeStrings(parser, strings):
+    '''
+    Parses the strings of a parse request.
+    Arguments:
+        parser: an SLRParser object
+        strings: a list of strings with tokens separated by blanks
+            or lists of tokens
+    Returns:
+        a list with the result dictionary of each string
+    '''
+    results = []
+    for string in strings:
+        tokens = string.split() if isinstance(string, str) else string
+        results.append(getParseResult(*parser.recognize(tokens)))
+    return results
+
+async def readRequestLine(reader):
+    '''
+    Reads the next request line of a client. A line longer than
+    REQUEST_LINE_LIMIT is skipped up to its end, so the requests
+    after it are still read.
+    Arguments:
+        reader: the asyncio stream reader of the connection
+    Returns:
+        the line as bytes, empty at the end of the stream,
+        None if the line was too long
+    '''
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        skippedBytes = error.consumed
+
+    while True:
+        await reader.readexactly(skippedBytes)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as error:
+            skippedBytes = error.consumed
+
+class ParseServer:
+    '''
+    Answers requests of newline delimited JSON objects, one response
+    line per request line. Requests have an "op" field:
+        register: compiles the "productions" list of strings and
+            answers with the "grammar" hash
+        parse: parses each string in "strings", lists of tokens or
+            strings with tokens separated by blanks, with the
+            registered "grammar" and answers with their "results"
+        grammars: answers with the hashes of the registered "grammars"
+    Failed requests are answered with "ok" set to false and an "error".
+    '''
+
+    def __init__(self, registry = None):
+        if registry is None:
+            registry = GrammarRegistry()
+        self.registry = registry
+
+    async def answer(self, request):
+        '''
+        Returns the response to a decoded request.
+        Arguments:
+            request: a dictionary with the request fields
+        Returns:
+            a dictionary with the response fields
+        '''
+        if not isinstance(request, dict):
+            raise RequestError("Error: a request must be a JSON object.")
+        operation = request.get("op")
+
+        if operation == "register":
+            productions = request.get("productions")
+            if (not isinstance(productions, list) or len(productions) == 0 or
+                    not all(isinstance(production, str) for production in productions)):
+                raise RequestError("Error: a register request needs a list of productions.")
+            try:
+                grammarHash = await self.registry.register(productions)
+            except IndexError:
+                raise RequestError("Error: malformed production.")
+            except TableConflictError as error:
+                raise RequestError(str(error))
+            return {"ok": True, "grammar": grammarHash}
+
+        elif operation == "parse":
+            grammarHash = request.get("grammar")
+            if not isinstance(grammarHash, str):
+                raise RequestError("Error: a parse request needs the hash of a registered grammar.")
+            parser = self.registry.getParser(grammarHash)
+            strings = request.get("strings")
+            if not isinstance(strings, list) or not all(isValidString(string) for string in strings):
+                raise RequestError("Error: a parse request needs a list of strings.")
+            # Strings are parsed in a worker thread so that other clients are not held back
+            results = await asyncio.to_thread(recognizeStrings, parser, strings)
+            return {"ok": True, "results": results}
+
+        elif operation == "grammars":
+            return {"ok": True, "grammars": list(self.registry.parsers)}
+
+        raise RequestError(f"Error: unknown operation \"{operation}\".")
+
+    async def handleClient(self, reader, writer):
+        '''
+        Answers the requests of a client until it closes the connection.
+        Arguments:
+            reader: the asyncio stream reader of the connection
+            writer: the asyncio stream writer of the connection
+        '''
+        try:
+            while True:
+                line = await readRequestLine(reader)
+                if line is None:
+                    response = {"ok": False, "error": f"Error: request is longer than {REQUEST_LINE_LIMIT} bytes."}
+                    writer.write((json.dumps(response) + "\n").encode())
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    response = await self.answer(json.loads(line))
+                except json.JSONDecodeError as error:
+                    response = {"ok": False, "error": f"Error: request is not valid JSON ({error.msg})."}
+                except RequestError as error:
+                    response = {"ok": False, "error": str(error)}
+
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host = "127.0.0.1", port = 0, unixSocket = None):
+        '''
+        Starts listening on a TCP address or a Unix socket.
+        Arguments:
+            host: the TCP host to listen on
+            port: the TCP port to listen on, 0 picks a free one
+            unixSocket: the route of a Unix socket, used instead of TCP if given
+        Returns:
+            the asyncio server object
+        '''
+        if unixSocket is not None:
+            return await asyncio.start_unix_server(self.handleClient, path=unixSocket, limit=REQUEST_LINE_LIMIT)
+        return await asyncio.start_server(self.handleClient, host, port, limit=REQUEST_LINE_LIMIT)
@@ -0,0 +1,648 @@
+# Parsing of token strings with an SLR table, either recording every
+# step of the process or only reporting whether they are accepted
+
+from itertools import chain
+
+from .grammar import EOF, ERROR_TOKEN, header
+from .parse_tree import ParseTree
+from .slr_table import ACCEPT, ACCEPT_ACTION, EMPTY_GOTO, ERROR_ACTION, REDUCE, SHIFT
+
+# Tokens that must be shifted after recovering from an error before
+# a new error is reported, errors before that discard the token
+RECOVERY_SHIFTS = 3
+
+class ParsingError(Exception):
+    '''
+    Raised while parsing a string when it can't be derived by the grammar,
+    its argument is the error message.
+    '''
+
+def getStackStringState(stack, string):
+    '''
+    Returns a list with two elements: the contents of the stack and
+    the contents of an input string used in a parsing process, as strings.
+    Arguments:
+        stack: a list used as a stack when parsing a string
+        string: a list managed as a stack
+    Returns:
+        a list as described above
+    '''
+    return [" ".join(map(str, stack)), " ".join(map(str, reversed(string)))]
+
+def top(stack, name):
+    '''
+    Returns the top-most value of a stack. If the stack is empty,
+    it raises a ParsingError.
+    Arguments:
+        stack: a python list, last element must be the top
+        name: a string representing a descriptive name for the stack
+    Returns:
+        The element on the last position of the list
+    '''
+    if not len(stack) > 0:
+        raise ParsingError(f"Error: tried to remove a token from the {name} but it was empty.")
+
+    return stack[-1]
+
+def retrieveFromDict(dictArray, index, key):
+    '''
+    Retrieves a value from the specified position of an array of
+    dictionaries. If the position doesn't contain any values then
+    it raises a ParsingError.
+    Arguments:
+        dictArray: a list of dictionaries
+        index: the index of the dictionary
+        key: the key for the dictionary
+    Returns:
+        The value from the array of dictionaries
+    '''
+    if key in dictArray[index].keys():
+        return dictArray[index][key]
+    else:
+        raise ParsingError(f"Error: a required table value ({index}, \"{key}\"), doesn't exist.")
+
+class SLRParser:
+    '''
+    Parses strings of tokens with an SLR table. A parser holds no state
+    between strings, so one compiled table can serve any number of them.
+    Steps of a parse process are lists with the contents of the stack,
+    the remaining input string and the action performed.
+    Recognizing skips unit reduction chains unless the parser is created
+    to keep them; recorded processes always keep every step.
+    '''
+
+    def __init__(self, table, dense = False, compressed = False, keepUnitReductions = False):
+        self.table = table
+        self.grammar = table.grammar
+        self.dense = dense
+        self.compressed = compressed
+        self.keepUnitReductions = keepUnitReductions
+        self.actionSymbols = self.grammar.terminals.union({EOF})
+
+    def getPackedTables(self, bypassUnitReductions = False):
+        '''
+        Returns the tables packed into integer arrays that the parser
+        looks actions and gotos up in: the compressed tables if the parser
+        was created with them, the dense tables otherwise.
+        Arguments:
+            bypassUnitReductions: True for tables whose gotos skip
+                unit reduction chains
+        Returns:
+            a DenseTables or CompressedTables object
+        '''
+        if self.compressed:
+            return self.table.getCompressedTables(bypassUnitReductions)
+        return self.table.getDenseTables(bypassUnitReductions)
+
+    def parse(self, tokenList):
+        '''
+        Parses a string recording every step of the process, with the
+        dense or compressed tables if the parser was created with them.
+        Arguments:
+            tokenList: a list of tokens ending with the end of file token
+        Returns:
+            a list with two elements: the steps of the parse process
+            and the parse result message
+        '''
+        if self.dense or self.compressed:
+            return self.parseWithPackedTables(tokenList)
+        return self.parseWithDictionaries(tokenList)
+
+    def parseWithDictionaries(self, tokenList):
+        '''
+        Parses a string with the SLR table dictionaries, recording
+        every step of the process.
+        Arguments:
+            tokenList: a list of tokens ending with the end of file token
+        Returns:
+            a list with two elements: the steps of the parse process
+            and the parse result message
+        '''
+        itemActions = self.table.itemActions
+        itemTransitions = self.table.itemTransitions
+        productions = self.grammar.augmentedProductions
+        productionBodies = self.grammar.productionBodies
+
+        stack = [0]
+        string = tokenList.copy()
+        string.reverse()
+
+        parseSteps = []
+
+        try:
+            while True:
+                parseCellValues = getStackStringState(stack, string)
+
+                itemIndex = top(stack, "stack")
+                stringToken = top(string, "input string")
+                if stringToken not in self.actionSymbols:
+                    raise ParsingError(f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar.")
+
+                action = retrieveFromDict(itemActions, itemIndex, stringToken)
+                actionType = action[0]
+                actionParameter = action[1]
+
+                if actionType == SHIFT:
+                    parseCellValues.append(f"Shift {actionParameter}")
+
+                    stack.append(string.pop())
+                    stack.append(actionParameter)
+
+                elif actionType == REDUCE:
+                    parseCellValues.append(f"Reduce {actionParameter}")
+                    parseSteps.append(parseCellValues)
+
+                    tokensToRemove = 2 * len(productionBodies[actionParameter])
+                    for j in range(tokensToRemove):
+                        top(stack, "stack")
+                        stack.pop()
+                    topIndex = top(stack, "stack")
+                    productionHeader = header(productions[actionParameter])
+                    stack.append(productionHeader)
+
+                    # Goto continuation
+                    parseCellValues = getStackStringState(stack, string)
+
+                    destinationIndex = retrieveFromDict(itemTransitions, topIndex, productionHeader)
+                    parseCellValues.append(f"Goto {destinationIndex}")
+                    stack.append(destinationIndex)
+
+                elif actionType == ACCEPT:
+                    parseCellValues.append("Accept")
+                    parseSteps.append(parseCellValues)
+
+                    return (parseSteps, "Accepted.")
+
+                parseSteps.append(parseCellValues)
+
+        except ParsingError as error:
+            errorMessage = str(error)
+            parseCellValues = getStackStringState(stack, string)
+            parseCellValues.append(errorMessage)
+            parseSteps.append(parseCellValues)
+            return (parseSteps, f"Unaccepted. {errorMessage}")
+
+    def parseWithPackedTables(self, tokenList):
+        '''
+        Parses a string like parseWithDictionaries, but looking up actions
+        and gotos in the tables packed into integer arrays.
+        Arguments:
+            tokenList: a list of tokens ending with the end of file token
+        Returns:
+            a list with two elements: the steps of the parse process
+            and the parse result message
+        '''
+        packedTables = self.getPackedTables()
+        terminalColumns = packedTables.terminalColumns
+        getAction = packedTables.getAction
+        getGoto = packedTables.getGoto
+
+        stack = [0]
+        string = tokenList.copy()
+        string.reverse()
+
+        errorMessage = None
+        parseSteps = []
+
+        while True:
+            parseCellValues = getStackStringState(stack, string)
+
+            itemIndex = stack[-1]
+            stringToken = string[-1]
+            if stringToken not in terminalColumns:
+                errorMessage = f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar."
+                break
+
+            action = getAction(itemIndex, terminalColumns[stringToken])
+            if action == ERROR_ACTION:
+                errorMessage = f"Error: a required table value ({itemIndex}, \"{stringToken}\"), doesn't exist."
+                break
+
+            if action > 0:
+                destinationIndex = action - 1
+                parseCellValues.append(f"Shift {destinationIndex}")
+
+                stack.append(string.pop())
+                stack.append(destinationIndex)
+
+            elif action == ACCEPT_ACTION:
+                parseCellValues.append("Accept")
+                parseSteps.append(parseCellValues)
+
+                break
+
+            else:
+                productionIndex = -action - 1
+                parseCellValues.append(f"Reduce {productionIndex}")
+                parseSteps.append(parseCellValues)
+
+                del stack[len(stack) - 2 * packedTables.productionLengths[productionIndex]:]
+                topIndex = stack[-1]
+                productionHeader = packedTables.productionHeaders[productionIndex]
+                stack.append(productionHeader)
+
+                # Goto continuation
+                parseCellValues = getStackStringState(stack, string)
+
+                gotoColumn = packedTables.productionGotoColumns[productionIndex]
+                destinationIndex = getGoto(topIndex, gotoColumn)
+                if destinationIndex == EMPTY_GOTO:
+                    errorMessage = f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist."
+                    break
+                parseCellValues.append(f"Goto {destinationIndex}")
+                stack.append(destinationIndex)
+
+            parseSteps.append(parseCellValues)
+
+        if errorMessage is not None:
+            parseCellValues = getStackStringState(stack, string)
+            parseCellValues.append(errorMessage)
+            parseSteps.append(parseCellValues)
+            return (parseSteps, f"Unaccepted. {errorMessage}")
+
+        return (parseSteps, "Accepted.")
+
+    def recognize(self, tokens):
+        '''
+        Parses a stream of tokens with the packed tables without recording
+        the process, the stack only keeps item indices and tokens are
+        consumed one by one. Unit reduction chains are skipped unless
+        the parser keeps them, which can move the item an error is
+        reported at, but not its position.
+        Arguments:
+            tokens: an iterable of tokens, without the end of file token
+        Returns:
+            a list with two elements: the position of the token where the
+            parsing failed, counting from 1, and an error message;
+            both are None if the string is accepted
+        '''
+        packedTables = self.getPackedTables(not self.keepUnitReductions)
+        terminalColumns = packedTables.terminalColumns
+        getAction = packedTables.getAction
+        getGoto = packedTables.getGoto
+        productionLengths = packedTables.productionLengths
+        productionGotoColumns = packedTables.productionGotoColumns
+
+        stack = [0]
+        tokenIterator = chain(tokens, (EOF,))
+        stringToken = next(tokenIterator)
+        position = 1
+
+        while True:
+            if stringToken not in terminalColumns:
+                return (position, f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar.")
+
+            itemIndex = stack[-1]
+            action = getAction(itemIndex, terminalColumns[stringToken])
+
+            if action > 0:
+                stack.append(action - 1)
+                stringToken = next(tokenIterator, None)
+                position += 1
+                if stringToken is None:
+                    return (position, "Error: tried to remove a token from the input string but it was empty.")
+
+            elif action == ACCEPT_ACTION:
+                return (None, None)
+
+            elif action == ERROR_ACTION:
+                return (position, f"Error: a required table value ({itemIndex}, \"{stringToken}\"), doesn't exist.")
+
+            else:
+                productionIndex = -action - 1
+                tokensToRemove = productionLengths[productionIndex]
+                if tokensToRemove > 0:
+                    del stack[-tokensToRemove:]
+
+                topIndex = stack[-1]
+                destinationIndex = getGoto(topIndex, productionGotoColumns[productionIndex])
+                if destinationIndex == EMPTY_GOTO:
+                    productionHeader = packedTables.productionHeaders[productionIndex]
+                    return (position, f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist.")
+                stack.append(destinationIndex)
+
+    def buildTree(self, tokens):
+        '''
+        Parses a stream of tokens like recognize, building the parse tree
+        of the string: shifts add leaves and reductions add a node with
+        the nodes they pop as children. Unit reductions are always
+        performed, since they are nodes of the tree.
+        Arguments:
+            tokens: an iterable of tokens, without the end of file token
+        Returns:
+            a list with three elements: the ParseTree object, None if the
+            parsing failed, the position of the token where it failed,
+            counting from 1, and an error message; both are None if
+            the string is accepted
+        '''
+        packedTables = self.getPackedTables()
+        terminalColumns = packedTables.terminalColumns
+        getAction = packedTables.getAction
+        getGoto = packedTables.getGoto
+        productionLengths = packedTables.productionLengths
+        productionGotoColumns = packedTables.productionGotoColumns
+
+        # The tree's arrays are filled here instead of with addLeaf and
+        # addNode, which would be a call per node
+        tree = ParseTree(self.grammar)
+        symbolIds = self.grammar.symbolIds
+        nodeProductions = tree.nodeProductions
+        nodeFirstChildren = tree.nodeFirstChildren
+        nodeChildCounts = tree.nodeChildCounts
+        nodeSpanStarts = tree.nodeSpanStarts
+        nodeSpanEnds = tree.nodeSpanEnds
+        treeChildren = tree.children
+        tokenSymbols = tree.tokenSymbols
+
+        stack = [0]
+        nodeStack = []
+        tokenIterator = chain(tokens, (EOF,))
+        stringToken = next(tokenIterator)
+        position = 1
+
+        while True:
+            if stringToken not in terminalColumns:
+                return (None, position, f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar.")
+
+            itemIndex = stack[-1]
+            action = getAction(itemIndex, terminalColumns[stringToken])
+
+            if action > 0:
+                stack.append(action - 1)
+                tokenSymbols.append(symbolIds[stringToken])
+                nodeStack.append(-position)
+                stringToken = next(tokenIterator, None)
+                position += 1
+                if stringToken is None:
+                    return (None, position, "Error: tried to remove a token from the input string but it was empty.")
+
+            elif action == ACCEPT_ACTION:
+                tree.root = nodeStack[-1]
+                return (tree, None, None)
+
+            elif action == ERROR_ACTION:
+                return (None, position, f"Error: a required table value ({itemIndex}, \"{stringToken}\"), doesn't exist.")
+
+            else:
+                productionIndex = -action - 1
+                tokensToRemove = productionLengths[productionIndex]
+                nodeFirstChildren.append(len(treeChildren))
+                nodeChildCounts.append(tokensToRemove)
+                if tokensToRemove > 0:
+                    del stack[-tokensToRemove:]
+                    firstChild = nodeStack[-tokensToRemove]
+                    lastChild = nodeStack[-1]
+                    nodeSpanStarts.append(-firstChild - 1 if firstChild < 0 else nodeSpanStarts[firstChild])
+                    nodeSpanEnds.append(-lastChild if lastChild < 0 else nodeSpanEnds[lastChild])
+                    treeChildren.extend(nodeStack[-tokensToRemove:])
+                    del nodeStack[-tokensToRemove:]
+                else:
+                    nodeSpanStarts.append(position - 1)
+                    nodeSpanEnds.append(position - 1)
+                nodeStack.append(len(nodeProductions))
+                nodeProductions.append(productionIndex)
+
+                topIndex = stack[-1]
+                destinationIndex = getGoto(topIndex, productionGotoColumns[productionIndex])
+                if destinationIndex == EMPTY_GOTO:
+                    productionHeader = packedTables.productionHeaders[productionIndex]
+                    return (None, position, f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist.")
+                stack.append(destinationIndex)
+
+    def evaluationBypassesUnitReductions(self, semanticActions):
+        '''
+        Checks if evaluating strings skips unit reductions, which it
+        does unless the parser keeps them or one of them has an action.
+        Arguments:
+            semanticActions: a SemanticActions object of the parser's grammar
+        Returns:
+            True if evaluate uses the tables that bypass unit reductions
+        '''
+        if self.keepUnitReductions:
+            return False
+        dispatchList = semanticActions.getDispatchList()
+        productionBodies = self.grammar.productionBodies
+        for productionId in range(1, len(dispatchList)):
+            if dispatchList[productionId] is not None and len(productionBodies[productionId]) == 1:
+                return False
+        return True
+
+    def evaluate(self, tokens, semanticActions):
+        '''
+        Parses a stream of tokens like recognize, running the semantic
+        action of each reduction on the values it pops from a value stack
+        parallel to the item stack, and pushing its result. Shifts push
+        the values of the tokens. Unit reductions are skipped unless the
+        parser keeps them or one of them has an action.
+        Arguments:
+            tokens: an iterable of tokens, without the end of file token,
+                each one a sequence whose first two elements are its
+                terminal and its value, like the tuples of Lexer.tokenize
+            semanticActions: a SemanticActions object of the parser's grammar
+        Returns:
+            a list with three elements: the value of the start symbol,
+            None if the parsing failed, the position of the token where
+            it failed, counting from 1, and an error message; both are
+            None if the string is accepted
+        '''
+        dispatchList = semanticActions.getDispatchList()
+        packedTables = self.getPackedTables(self.evaluationBypassesUnitReductions(semanticActions))
+        terminalColumns = packedTables.terminalColumns
+        getAction = packedTables.getAction
+        getGoto = packedTables.getGoto
+        productionLengths = packedTables.productionLengths
+        productionGotoColumns = packedTables.productionGotoColumns
+
+        stack = [0]
+        valueStack = []
+        tokenIterator = chain(tokens, ((EOF, None),))
+        stringToken, tokenValue = next(tokenIterator)[:2]
+        position = 1
+
+        while True:
+            if stringToken not in terminalColumns:
+                return (None, position, f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar.")
+
+            itemIndex = stack[-1]
+            action = getAction(itemIndex, terminalColumns[stringToken])
+
+            if action > 0:
+                stack.append(action - 1)
+                valueStack.append(tokenValue)
+                nextToken = next(tokenIterator, None)
+                position += 1
+                if nextToken is None:
+                    return (None, position, "Error: tried to remove a token from the input string but it was empty.")
+                stringToken, tokenValue = nextToken[:2]
+
+            elif action == ACCEPT_ACTION:
+                return (valueStack[-1], None, None)
+
+            elif action == ERROR_ACTION:
+                return (None, position, f"Error: a required table value ({itemIndex}, \"{stringToken}\"), doesn't exist.")
+
+            else:
+                productionIndex = -action - 1
+                tokensToRemove = productionLengths[productionIndex]
+                semanticAction = dispatchList[productionIndex]
+                if tokensToRemove > 0:
+                    del stack[-tokensToRemove:]
+                    if semanticAction is None:
+                        value = valueStack[-tokensToRemove]
+                    else:
+                        value = semanticAction(*valueStack[-tokensToRemove:])
+                    del valueStack[-tokensToRemove:]
+                else:
+                    value = None if semanticAction is None else semanticAction()
+                valueStack.append(value)
+
+                topIndex = stack[-1]
+                destinationIndex = getGoto(topIndex, productionGotoColumns[productionIndex])
+                if destinationIndex == EMPTY_GOTO:
+                    productionHeader = packedTables.productionHeaders[productionIndex]
+                    return (None, position, f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist.")
+                stack.append(destinationIndex)
+
+    def recognizeWithRecovery(self, tokens, synchronizingTerminals = None):
+        '''
+        Parses a stream of tokens like recognize, but recovering from
+        syntax errors to report all of them in one pass. On an error, if
+        the grammar has productions with the ERROR_TOKEN terminal, items
+        are popped until one that shifts it, which is shifted in place of
+        the erroneous text. Otherwise, in panic mode, tokens are skipped
+        until one of the synchronizing terminals, or the token after it,
+        that an item of the stack has an action for, which is popped to;
+        or without synchronizing terminals, until a token that follows a non-terminal that an item
+        of the stack has a goto for, which is taken.
+        Errors found before RECOVERY_SHIFTS tokens are shifted after the
+        last one are not reported, their token is skipped instead.
+        Arguments:
+            tokens: an iterable of tokens, without the end of file token
+            synchronizingTerminals: a set of terminals, None to synchronize
+                with the follows of the non-terminals
+        Returns:
+            a list with an entry per error found, each one a list with the
+            position of the token where it was found, counting from 1,
+            and an error message; the list is empty if the string is accepted
+        '''
+        packedTables = self.getPackedTables(not self.keepUnitReductions)
+        terminalColumns = packedTables.terminalColumns
+        nonTerminalColumns = packedTables.nonTerminalColumns
+        getAction = packedTables.getAction
+        getGoto = packedTables.getGoto
+        productionLengths = packedTables.productionLengths
+        productionGotoColumns = packedTables.productionGotoColumns
+        errorColumn = terminalColumns.get(ERROR_TOKEN)
+
+        # Gotos of each item with the follows of their non-terminal,
+        # found the first time an item is recovered on
+        followsOf = dict()
+        recoveryGotos = dict()
+        def getRecoveryGotos(itemIndex):
+            if itemIndex not in recoveryGotos:
+                if len(followsOf) == 0:
+                    for nonTerminal in nonTerminalColumns:
+                        followsOf[nonTerminal] = set(self.table.firstFollow.followsOf(nonTerminal))
+                # Compressed gotos have a default, so the transitions tell which exist
+                itemGotos = []
+                for nonTerminal, column in nonTerminalColumns.items():
+                    if nonTerminal in self.table.itemTransitions[itemIndex]:
+                        itemGotos.append((getGoto(itemIndex, column), followsOf[nonTerminal]))
+                recoveryGotos[itemIndex] = itemGotos
+            return recoveryGotos[itemIndex]
+
+        def synchronize(stringToken, afterSynchronizingTerminal):
+            # Pops the stack to an item that can continue with the token, the
+            # token after a synchronizing terminal restarts from the bottom
+            depths = range(len(stack) - 1, -1, -1)
+            if afterSynchronizingTerminal:
+                depths = range(len(stack))
+            for depth in depths:
+                itemIndex = stack[depth]
+                if synchronizingTerminals is not None:
+                    if stringToken not in terminalColumns:
+                        return False
+                    if stringToken in synchronizingTerminals or afterSynchronizingTerminal:
+                        if getAction(itemIndex, terminalColumns[stringToken]) != ERROR_ACTION:
+                            del stack[depth + 1:]
+                            return True
+                    continue
+                for destinationIndex, follows in getRecoveryGotos(itemIndex):
+                    if stringToken in follows:
+                        del stack[depth + 1:]
+                        stack.append(destinationIndex)
+                        return True
+            return False
+
+        errors = []
+        stack = [0]
+        tokenIterator = chain(tokens, (EOF,))
+        stringToken = next(tokenIterator)
+        position = 1
+        shiftsSinceRecovery = RECOVERY_SHIFTS
+
+        while True:
+            itemIndex = stack[-1]
+            if stringToken in terminalColumns:
+                action = getAction(itemIndex, terminalColumns[stringToken])
+            else:
+                action = ERROR_ACTION
+
+            if action > 0:
+                stack.append(action - 1)
+                shiftsSinceRecovery += 1
+                stringToken = next(tokenIterator, None)
+                position += 1
+                if stringToken is None:
+                    errors.append((position, "Error: tried to remove a token from the input string but it was empty."))
+                    return errors
+
+            elif action == ACCEPT_ACTION:
+                return errors
+
+            elif action != ERROR_ACTION:
+                productionIndex = -action - 1
+                tokensToRemove = productionLengths[productionIndex]
+                if tokensToRemove > 0:
+                    del stack[-tokensToRemove:]
+
+                topIndex = stack[-1]
+                destinationIndex = getGoto(topIndex, productionGotoColumns[productionIndex])
+                if destinationIndex == EMPTY_GOTO:
+                    productionHeader = packedTables.productionHeaders[productionIndex]
+                    errors.append((position, f"Error: a required table value ({topIndex}, \"{productionHeader}\"), doesn't exist."))
+                    return errors
+                stack.append(destinationIndex)
+
+            else:
+                if shiftsSinceRecovery >= RECOVERY_SHIFTS:
+                    if stringToken not in terminalColumns:
+                        errors.append((position, f"Error: input string has a symbol (\"{stringToken}\") that is not recognized by the grammar."))
+                    else:
+                        errors.append((position, f"Error: a required table value ({itemIndex}, \"{stringToken}\"), doesn't exist."))
+                else:
+                    # Still recovering from the last error, the token is skipped
+                    if stringToken == EOF:
+                        return errors
+                    stringToken = next(tokenIterator)
+                    position += 1
+                shiftsSinceRecovery = 0
+
+                # Error productions take the place of the erroneous text
+                if errorColumn is not None:
+                    while len(stack) > 0 and getAction(stack[-1], errorColumn) <= 0:
+                        stack.pop()
+                    if len(stack) > 0:
+                        stack.append(getAction(stack[-1], errorColumn) - 1)
+                        continue
+                    stack.append(0)
+
+                # Panic mode, tokens are skipped until one the stack can continue with
+                afterSynchronizingTerminal = False
+                while not synchronize(stringToken, afterSynchronizingTerminal):
+                    if stringToken == EOF:
+                        return errors
+                    afterSynchronizingTerminal = synchronizingTerminals is not None and \
+                        stringToken in synchronizingTerminals
+                    stringToken = next(tokenIterator)
+                    position += 1
@@ -0,0 +1,820 @@
+# SLR analysis table of a grammar: the LR(0) item tree with its
+# transitions, and the actions of each item
+
+from array import array
+
+from .first_follow import FirstFollow, bitsetMembers
+from .grammar import BODY_START_INDEX, EOF, LEFT, RIGHT, header
+
+DOT = "•"
+SHIFT = "S"
+REDUCE = "R"
+ACCEPT = "AC"
+DOT_BITS = 16
+ERROR_ACTION = 0
+ERROR_CELL = "error"
+ACCEPT_ACTION = -1
+EMPTY_GOTO = -1
+
+class TableConflictError(Exception):
+    '''
+    Raised when two actions are stored in the same cell of the table.
+    '''
+
+class TableConflict:
+    '''
+    A cell of a table where more than one action was stored, with
+    a description of the actions and the one that was kept: shifts are
+    kept over reductions, and reductions by earlier productions over
+    later ones.
+    '''
+
+    def __init__(self, tableType, itemIndex, terminal, actionDescriptions, keptDescription, kind):
+        self.tableType = tableType
+        self.itemIndex = itemIndex
+        self.terminal = terminal
+        self.actionDescriptions = actionDescriptions
+        self.keptDescription = keptDescription
+        self.kind = kind
+
+    def getErrorMessage(self):
+        '''
+        Returns the error message for the conflict when it stops the
+        construction of the table.
+        '''
+        return f"Error: overlap in {self.tableType} table cell ({self.itemIndex}, \"{self.terminal}\")."
+
+    def __str__(self):
+        return (f"{self.kind} conflict in {self.tableType} table cell ({self.itemIndex}, \"{self.terminal}\"): " +
+                " / ".join(self.actionDescriptions) + f"; kept {self.keptDescription}")
+
+class Queue:
+    """
+    A simple FIFO queue data structure built
+    space-inefficiently on top of a list.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.frontIndex = 0
+
+    def insert(self, value):
+        self.values.append(value)   
+
+    def remove(self):
+        value = self.values[self.frontIndex]
+        self.frontIndex += 1
+        return value
+
+    def empty(self):
+        return (self.frontIndex == len(self.values))
+
+class ProductionWithDot:
+    '''
+    A grammar production, referenced by its id, with a marker (dot)
+    that can be moved between the body's symbols.
+    The item is packed into a single integer key so that hashing
+    and comparing items are constant time operations.
+    '''
+    __slots__ = ("grammar", "productionId", "dotIndex", "key")
+
+    def __init__(self, grammar, productionId, dotIndex = 0):
+        self.grammar = grammar
+        self.productionId = productionId
+        self.dotIndex = dotIndex # Index of body symbol that is right after the dot
+        self.key = (productionId << DOT_BITS) | dotIndex
+
+    def underlined(self):
+        '''
+        Returns the id of the symbol after the dot or None 
+        if dot is at the end of the production.
+        '''
+        if not self.completed():
+            return self.grammar.productionBodies[self.productionId][self.dotIndex]
+        else:
+            return None
+
+    def advanceDot(self):
+        '''
+        Returns a copy of the object with the 
+        dot one positiono ahead.
+        '''
+        advancedProduction = ProductionWithDot(self.grammar, self.productionId, self.dotIndex + 1)
+        return advancedProduction
+
+    def completed(self):
+        '''
+        Returns true if the dot has advanced to 
+        the end of the production's body.
+        '''
+        return (not self.dotIndex < len(self.grammar.productionBodies[self.productionId]))
+
+    def getProduction(self):
+        '''
+        Returns the object's production as a list of tokens.
+        '''
+        return self.grammar.augmentedProductions[self.productionId]
+
+    def __eq__(self, other):
+        if isinstance(other, ProductionWithDot):
+            return (self.key == other.key)
+        else:
+            return False
+
+    def __ne__(self, other):
+        return (not self.__eq__(other))
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __str__(self):
+        separator = " "
+        production = self.getProduction()
+        splitIndex = BODY_START_INDEX + self.dotIndex
+        stringRep = separator.join(production[:splitIndex])
+        stringRep += separator + DOT + separator
+        if not self.completed():
+            stringRep += separator.join(production[splitIndex:])
+
+        return stringRep
+
+def packAction(action):
+    '''
+    Packs an action of the SLR table into a signed integer:
+    shifts are positive, reductions are negative and accepting
+    is the reduction of the artificial production.
+    Arguments:
+        action: a tuple with the action type and its parameter
+    Returns:
+        the packed action as an integer
+    '''
+    actionType = action[0]
+    actionParameter = action[1]
+    if actionType == SHIFT:
+        return actionParameter + 1
+    elif actionType == REDUCE:
+        return -(actionParameter + 1)
+    return ACCEPT_ACTION
+
+class DenseTables:
+    '''
+    The actions and gotos of a table packed into flat integer arrays,
+    with one row per item and one column per symbol. Actions are packed
+    with packAction and empty gotos are EMPTY_GOTO. The cells emptied by
+    non-associativity are kept as (item index, terminal column) pairs.
+    Unit reduction chains can be bypassed in the gotos, see
+    bypassUnitReductions.
+    '''
+
+    def __init__(self, table, bypassUnitReductions = False):
+        grammar = table.grammar
+
+        self.terminalColumns = dict()
+        for terminal in sorted(grammar.terminals) + [EOF]:
+            self.terminalColumns[terminal] = len(self.terminalColumns)
+
+        self.nonTerminalColumns = dict()
+        for production in grammar.productions:
+            if header(production) not in self.nonTerminalColumns:
+                self.nonTerminalColumns[header(production)] = len(self.nonTerminalColumns)
+
+        # Header name, header column and body length of each production
+        self.productionHeaders = [None]
+        self.productionGotoColumns = [None]
+        self.productionLengths = [len(grammar.productionBodies[0])]
+        for productionId in range(1, len(grammar.augmentedProductions)):
+            productionHeader = header(grammar.augmentedProductions[productionId])
+            self.productionHeaders.append(productionHeader)
+            self.productionGotoColumns.append(self.nonTerminalColumns[productionHeader])
+            self.productionLengths.append(len(grammar.productionBodies[productionId]))
+
+        numberOfItems = len(table.itemActions)
+        self.actionTable = array("i", [ERROR_ACTION]) * (numberOfItems * len(self.terminalColumns))
+        self.gotoTable = array("i", [EMPTY_GOTO]) * (numberOfItems * len(self.nonTerminalColumns))
+
+        for itemIndex in range(numberOfItems):
+            actionRow = itemIndex * len(self.terminalColumns)
+            for terminal, action in table.itemActions[itemIndex].items():
+                self.actionTable[actionRow + self.terminalColumns[terminal]] = packAction(action)
+
+            gotoRow = itemIndex * len(self.nonTerminalColumns)
+            for symbol, destinationIndex in table.itemTransitions[itemIndex].items():
+                if symbol in self.nonTerminalColumns:
+                    self.gotoTable[gotoRow + self.nonTerminalColumns[symbol]] = destinationIndex
+
+        self.errorCells = set()
+        for itemIndex, terminal in table.errorCells:
+            self.errorCells.add((itemIndex, self.terminalColumns[terminal]))
+
+        self.bypassedGotos = 0
+        if bypassUnitReductions:
+            self.bypassUnitReductions()
+
+    def bypassUnitReductions(self):
+        '''
+        Rewrites the gotos so that they skip the items whose only action
+        is a reduction by a unit production, like A -> B. Going to such an
+        item with B is always followed by popping it and going with A from
+        the same item, so the goto leads to that destination instead, and
+        the reduction is never performed. Chains of unit reductions are
+        followed to their end; cycles of them are left untouched.
+        An item is only skipped if its destination has no action under the
+        lookaheads it rejects, so errors are found at the same token; items
+        with cells emptied by non-associativity are never skipped.
+        '''
+        numberOfTerminals = len(self.terminalColumns)
+        numberOfNonTerminals = len(self.nonTerminalColumns)
+        numberOfItems = len(self.actionTable) // numberOfTerminals
+        itemsWithErrorCells = {itemIndex for itemIndex, column in self.errorCells}
+
+        # Columns with an action of each item, as the bits of an integer
+        actionColumns = []
+        for itemIndex in range(numberOfItems):
+            rowStart = itemIndex * numberOfTerminals
+            columns = 0
+            for column in range(numberOfTerminals):
+                if self.actionTable[rowStart + column] != ERROR_ACTION:
+                    columns |= 1 << column
+            actionColumns.append(columns)
+
+        # Production of the unit reduction of each item that only has one
+        unitReductions = dict()
+        for itemIndex in range(numberOfItems):
+            if itemIndex in itemsWithErrorCells:
+                continue
+            rowStart = itemIndex * numberOfTerminals
+            actions = set(self.actionTable[rowStart:rowStart + numberOfTerminals])
+            actions.discard(ERROR_ACTION)
+            if len(actions) != 1:
+                continue
+            action = actions.pop()
+            if action < ACCEPT_ACTION and self.productionLengths[-action - 1] == 1:
+                unitReductions[itemIndex] = -action - 1
+
+        if len(unitReductions) == 0:
+            return
+
+        originalGotos = self.gotoTable
+        self.gotoTable = array("i", originalGotos)
+        for itemIndex in range(numberOfItems):
+            gotoRow = itemIndex * numberOfNonTerminals
+            for column in range(numberOfNonTerminals):
+                destinationIndex = originalGotos[gotoRow + column]
+                skippedItems = set()
+                while destinationIndex in unitReductions and destinationIndex not in skippedItems:
+                    productionId = unitReductions[destinationIndex]
+                    nextIndex = originalGotos[gotoRow + self.productionGotoColumns[productionId]]
+                    if nextIndex == EMPTY_GOTO or actionColumns[nextIndex] & ~actionColumns[destinationIndex]:
+                        break
+                    skippedItems.add(destinationIndex)
+                    destinationIndex = nextIndex
+                if destinationIndex in skippedItems:
+                    continue
+                if destinationIndex != originalGotos[gotoRow + column]:
+                    self.gotoTable[gotoRow + column] = destinationIndex
+                    self.bypassedGotos += 1
+
+    def getAction(self, itemIndex, terminalColumn):
+        '''
+        Returns the packed action of an item under a terminal.
+        Arguments:
+            itemIndex: the index of the item
+            terminalColumn: the column of the terminal
+        Returns:
+            the packed action as an integer
+        '''
+        return self.actionTable[itemIndex * len(self.terminalColumns) + terminalColumn]
+
+    def getGoto(self, itemIndex, nonTerminalColumn):
+        '''
+        Returns the item an item moves to under a non-terminal.
+        Arguments:
+            itemIndex: the index of the item
+            nonTerminalColumn: the column of the non-terminal
+        Returns:
+            the index of the destination item, EMPTY_GOTO if there is none
+        '''
+        return self.gotoTable[itemIndex * len(self.nonTerminalColumns) + nonTerminalColumn]
+
+    def numberOfCells(self):
+        '''
+        Returns the number of integers stored in the action and goto arrays.
+        '''
+        return len(self.actionTable) + len(self.gotoTable)
+
+def getMostCommonValue(values, candidates):
+    '''
+    Returns the value that appears the most times in a list,
+    among the ones accepted by a filter; ties go to the smallest value.
+    Arguments:
+        values: a list of integers
+        candidates: a function that tells if a value can be returned
+    Returns:
+        the most common accepted value, None if there are none
+    '''
+    counts = dict()
+    for value in values:
+        if candidates(value):
+            counts[value] = counts.get(value, 0) + 1
+    if len(counts) == 0:
+        return None
+    return min(counts, key=lambda value: (-counts[value], value))
+
+def packRows(rows, rowLength):
+    '''
+    Packs sparse rows into a single pair of arrays by row displacement:
+    each row is given a base position in the arrays such that its
+    entries land on free slots, and every slot records the row it
+    belongs to so that lookups can tell when a cell is missing.
+    Rows are placed first fit, from the one with more entries. Occupied
+    slots are kept as the bits of an integer, so the bases where a row
+    fits are found for all positions at once.
+    Arguments:
+        rows: a list of rows, each one a list of (column, value) pairs
+        rowLength: the number of columns of the rows
+    Returns:
+        a list with three arrays: the base of each row, the packed
+        values and the owner row of each slot, -1 for free slots
+    '''
+    rowBases = array("i", [0]) * len(rows)
+    occupiedSlots = 0
+    packedValues = array("i", [0]) * rowLength
+    slotOwners = array("i", [-1]) * rowLength
+
+    placementOrder = sorted(range(len(rows)), key=lambda rowIndex: -len(rows[rowIndex]))
+    for rowIndex in placementOrder:
+        row = rows[rowIndex]
+        if len(row) == 0:
+            continue
+
+        # A base is blocked if any of the row's columns lands on an occupied slot,
+        # the row is placed on the lowest base that isn't
+        blockedBases = 0
+        for column, value in row:
+            blockedBases |= occupiedSlots >> column
+        base = ((blockedBases + 1) & ~blockedBases).bit_length() - 1
+
+        requiredLength = base + rowLength
+        if requiredLength > len(slotOwners):
+            extraSlots = requiredLength - len(slotOwners)
+            packedValues.extend([0] * extraSlots)
+            slotOwners.extend([-1] * extraSlots)
+
+        rowBases[rowIndex] = base
+        for column, value in row:
+            occupiedSlots |= 1 << (base + column)
+            packedValues[base + column] = value
+            slotOwners[base + column] = rowIndex
+
+    return (rowBases, packedValues, slotOwners)
+
+class CompressedTables:
+    '''
+    The actions and gotos of a table compressed for size. Each item has
+    a default reduction, its most common one, that takes the place of
+    its empty action cells; the remaining action rows are shared between
+    items when identical and packed together by row displacement.
+    Gotos are packed the same way by non-terminal column, with the most
+    common destination of each column as its default: a goto is only
+    looked up after a reduction, so it always exists.
+    Default reductions delay the detection of an error by a few
+    reductions, but never past a shift. Cells emptied by
+    non-associativity are the exception, since the token could be
+    shifted after reducing, so they are stored as explicit errors
+    that the default reduction doesn't fill.
+    It has the same lookup interface as DenseTables.
+    '''
+
+    def __init__(self, denseTables):
+        self.terminalColumns = denseTables.terminalColumns
+        self.nonTerminalColumns = denseTables.nonTerminalColumns
+        self.productionHeaders = denseTables.productionHeaders
+        self.productionGotoColumns = denseTables.productionGotoColumns
+        self.productionLengths = denseTables.productionLengths
+
+        numberOfTerminals = len(self.terminalColumns)
+        numberOfNonTerminals = len(self.nonTerminalColumns)
+        numberOfItems = len(denseTables.actionTable) // numberOfTerminals
+
+        # Default reduction of each item and its remaining actions,
+        # items with identical remaining actions share a row
+        self.defaultActions = array("i", [ERROR_ACTION]) * numberOfItems
+        self.itemRows = array("i", [0]) * numberOfItems
+        rowIndices = dict()
+        actionRows = []
+        for itemIndex in range(numberOfItems):
+            rowStart = itemIndex * numberOfTerminals
+            actionRow = denseTables.actionTable[rowStart:rowStart + numberOfTerminals]
+            defaultAction = getMostCommonValue(actionRow, lambda action: action < ACCEPT_ACTION)
+            if defaultAction is None:
+                defaultAction = ERROR_ACTION
+            self.defaultActions[itemIndex] = defaultAction
+
+            remainingActions = []
+            for column in range(numberOfTerminals):
+                if actionRow[column] != defaultAction and actionRow[column] != ERROR_ACTION:
+                    remainingActions.append((column, actionRow[column]))
+                elif defaultAction != ERROR_ACTION and (itemIndex, column) in denseTables.errorCells:
+                    remainingActions.append((column, ERROR_ACTION))
+            rowKey = tuple(remainingActions)
+            if rowKey not in rowIndices:
+                rowIndices[rowKey] = len(actionRows)
+                actionRows.append(remainingActions)
+            self.itemRows[itemIndex] = rowIndices[rowKey]
+
+        self.actionBases, self.actionValues, self.actionOwners = packRows(actionRows, numberOfTerminals)
+
+        # Default destination of each non-terminal column and its remaining gotos
+        self.defaultGotos = array("i", [EMPTY_GOTO]) * numberOfNonTerminals
+        gotoColumns = []
+        for column in range(numberOfNonTerminals):
+            gotoColumn = denseTables.gotoTable[column::numberOfNonTerminals]
+            defaultGoto = getMostCommonValue(gotoColumn, lambda destinationIndex: destinationIndex != EMPTY_GOTO)
+            if defaultGoto is None:
+                defaultGoto = EMPTY_GOTO
+            self.defaultGotos[column] = defaultGoto
+
+            remainingGotos = []
+            for itemIndex in range(numberOfItems):
+                if gotoColumn[itemIndex] != defaultGoto and gotoColumn[itemIndex] != EMPTY_GOTO:
+                    remainingGotos.append((itemIndex, gotoColumn[itemIndex]))
+            gotoColumns.append(remainingGotos)
+
+        self.gotoBases, self.gotoValues, self.gotoOwners = packRows(gotoColumns, numberOfItems)
+
+    def getAction(self, itemIndex, terminalColumn):
+        '''
+        Returns the packed action of an item under a terminal.
+        Arguments:
+            itemIndex: the index of the item
+            terminalColumn: the column of the terminal
+        Returns:
+            the packed action as an integer
+        '''
+        rowIndex = self.itemRows[itemIndex]
+        slot = self.actionBases[rowIndex] + terminalColumn
+        if self.actionOwners[slot] == rowIndex:
+            return self.actionValues[slot]
+        return self.defaultActions[itemIndex]
+
+    def getGoto(self, itemIndex, nonTerminalColumn):
+        '''
+        Returns the item an item moves to under a non-terminal.
+        Arguments:
+            itemIndex: the index of the item
+            nonTerminalColumn: the column of the non-terminal
+        Returns:
+            the index of the destination item
+        '''
+        slot = self.gotoBases[nonTerminalColumn] + itemIndex
+        if self.gotoOwners[slot] == nonTerminalColumn:
+            return self.gotoValues[slot]
+        return self.defaultGotos[nonTerminalColumn]
+
+    def numberOfCells(self):
+        '''
+        Returns the number of integers stored in the compressed arrays.
+        '''
+        arrays = [self.defaultActions, self.itemRows, self.actionBases, self.actionValues,
+                  self.actionOwners, self.defaultGotos, self.gotoBases, self.gotoValues, self.gotoOwners]
+        return sum(len(values) for values in arrays)
+
+class SLRTable:
+    '''
+    The SLR analysis table of a grammar. Items of the LR(0) item tree
+    are identified by their index, and for each one it stores its
+    kernel, its whole list of productions with dot, its transitions
+    under each symbol and its actions under each terminal.
+    Reductions are placed under the follows of the production's header.
+    '''
+    TABLE_TYPE = "SLR"
+
+    def __init__(self, grammar, firstFollow = None, collectConflicts = False):
+        self.grammar = grammar
+        if firstFollow is None:
+            firstFollow = FirstFollow(grammar)
+        self.firstFollow = firstFollow
+        self.collectConflicts = collectConflicts
+
+        # Conflicts left in the table, and cells emptied by non-associativity
+        self.conflicts = []
+        self.errorCells = set()
+
+        self.itemKernels = []
+        self.itemProductions = []
+        self.itemTransitions = []
+        self.itemActions = []
+        # Packed tables, keyed by whether they bypass unit reductions
+        self.denseTables = dict()
+        self.compressedTables = dict()
+
+        self.buildItemTree()
+        self.storeShiftActions()
+        self.storeReduceActions()
+
+    def numberOfItems(self):
+        '''
+        Returns the number of items in the item tree.
+        '''
+        return len(self.itemKernels)
+
+    def getClosures(self):
+        '''
+        Precomputes the closure of each non-terminal: the initial items of every
+        non-terminal reachable through the first symbol of a production's body.
+        Returns:
+            a dictionary with the list of items of each non-terminal id
+        '''
+        grammar = self.grammar
+
+        # Make dictionary of production ids organized by non-terminal id
+        productionsOf = dict()
+        for nonTerminalId in grammar.nonTerminalIds:
+            productionsOf[nonTerminalId] = []
+
+        for productionId in range(1, len(grammar.augmentedProductions)):
+            productionsOf[grammar.productionHeaders[productionId]].append(productionId)
+
+        closuresOf = dict()
+        for nonTerminalId in grammar.nonTerminalIds:
+            closureItems = []
+            reachedNonTerms = [nonTerminalId]
+            reachedSet = {nonTerminalId}
+            i = 0
+            while i < len(reachedNonTerms):
+                for productionId in productionsOf[reachedNonTerms[i]]:
+                    closureItems.append(ProductionWithDot(grammar, productionId))
+                    productionBody = grammar.productionBodies[productionId]
+                    if len(productionBody) == 0:
+                        continue
+                    firstSymbol = productionBody[0]
+                    if firstSymbol in grammar.nonTerminalIds and firstSymbol not in reachedSet:
+                        reachedSet.add(firstSymbol)
+                        reachedNonTerms.append(firstSymbol)
+                i += 1
+            closuresOf[nonTerminalId] = closureItems
+        return closuresOf
+
+    def getKernelClosure(self, kernel, closuresOf, closureCache):
+        '''
+        Returns the productions of the non-terminals with dot before them
+        in a kernel, kernels that expect the same non-terminals share the
+        same closure.
+        Arguments:
+            kernel: a list of productions with dot
+            closuresOf: the closure of each non-terminal id, from getClosures
+            closureCache: a dictionary with the closures already built,
+                keyed by the frozen set of expected non-terminal ids
+        Returns:
+            a list of productions with dot, without repetitions
+        '''
+        expectedNonTerms = set()
+        for productionWithDot in kernel:
+            underlinedSymbol = productionWithDot.underlined()
+            if underlinedSymbol in self.grammar.nonTerminalIds:
+                expectedNonTerms.add(underlinedSymbol)
+        closureKey = frozenset(expectedNonTerms)
+
+        if closureKey not in closureCache:
+            closureItems = dict()
+            for nonTerminalId in sorted(closureKey):
+                closureItems.update(dict.fromkeys(closuresOf[nonTerminalId]))
+            closureCache[closureKey] = list(closureItems)
+
+        return closureCache[closureKey]
+
+    def buildItemTree(self):
+        '''
+        Builds the LR(0) item tree with a breath first traversal,
+        starting from the item with the artificial production.
+        '''
+        grammar = self.grammar
+        closuresOf = self.getClosures()
+
+        # Closures already built for a set of non-terminals expected by a kernel
+        closureCache = dict()
+
+        # Index of the item that owns each kernel, keyed by the frozen kernel
+        kernelIndices = dict()
+        itemQueue = Queue()
+
+        # Insert new production into kernel of item 0
+        initialKernel = [ProductionWithDot(grammar, 0)]
+        self.itemKernels.append(initialKernel)
+        kernelIndices[frozenset(initialKernel)] = 0
+        itemQueue.insert(0)
+
+        while not itemQueue.empty():
+            itemIndex = itemQueue.remove()
+            kernel = self.itemKernels[itemIndex]
+
+            self.itemProductions.append(kernel + self.getKernelClosure(kernel, closuresOf, closureCache))
+
+            # Bucket the advanced productions by the symbol they are derived under
+            derivedKernels = dict()
+            for productionWithDot in self.itemProductions[itemIndex]:
+                underlinedSymbol = productionWithDot.underlined()
+                if underlinedSymbol is None:
+                    continue
+                if underlinedSymbol not in derivedKernels:
+                    derivedKernels[underlinedSymbol] = set()
+                derivedKernels[underlinedSymbol].add(productionWithDot.advanceDot())
+
+            # Derive for each terminal and non-terminal
+            self.itemTransitions.append(dict())
+            for symbol in grammar.symbols:
+                symbolId = grammar.symbolIds[symbol]
+                if symbolId not in derivedKernels:
+                    continue
+                derivedKernel = derivedKernels[symbolId]
+                frozenKernel = frozenset(derivedKernel)
+
+                if not frozenKernel in kernelIndices:
+                    # Create brand new item
+                    self.itemKernels.append(list(derivedKernel))
+                    destinationIndex = len(self.itemKernels) - 1
+                    kernelIndices[frozenKernel] = destinationIndex
+                    itemQueue.insert(destinationIndex)
+                else:
+                    destinationIndex = kernelIndices[frozenKernel]
+
+                # Store transitions between items
+                self.itemTransitions[itemIndex][symbol] = destinationIndex
+
+    def insertAction(self, itemIndex, terminal, action):
+        '''
+        Inserts an action in the table. If the cell is already occupied
+        the conflict is resolved with the grammar's precedences if possible.
+        Otherwise it raises a TableConflictError, or records the conflict
+        and keeps one of the actions when conflicts are being collected.
+        Arguments:
+            itemIndex: the index of the item
+            terminal: the terminal the action is taken under
+            action: a tuple with the action type and its parameter
+        '''
+        if (itemIndex, terminal) in self.errorCells:
+            return
+        if not terminal in self.itemActions[itemIndex].keys():
+            self.itemActions[itemIndex][terminal] = action
+            return
+
+        storedAction = self.itemActions[itemIndex][terminal]
+        resolvedAction = self.resolveConflict(terminal, storedAction, action)
+        if resolvedAction == ERROR_CELL:
+            del self.itemActions[itemIndex][terminal]
+            self.errorCells.add((itemIndex, terminal))
+            return
+        if resolvedAction is not None:
+            self.itemActions[itemIndex][terminal] = resolvedAction
+            return
+
+        keptAction = min(storedAction, action, key=lambda cellAction: (cellAction[0] != SHIFT, cellAction[1] or 0))
+        kind = "shift/reduce" if SHIFT in (storedAction[0], action[0]) else "reduce/reduce"
+        conflict = TableConflict(self.TABLE_TYPE, itemIndex, terminal,
+                                 [self.describeAction(itemIndex, terminal, storedAction),
+                                  self.describeAction(itemIndex, terminal, action)],
+                                 self.describeAction(itemIndex, terminal, keptAction), kind)
+        if not self.collectConflicts:
+            raise TableConflictError(conflict.getErrorMessage())
+
+        self.conflicts.append(conflict)
+        self.itemActions[itemIndex][terminal] = keptAction
+
+    def resolveConflict(self, terminal, storedAction, newAction):
+        '''
+        Resolves a conflict between a shift and a reduction with the
+        precedences of the terminal and the production: the one with
+        the higher precedence wins, and on the same level the
+        associativity decides, left reduces, right shifts and
+        non-associative leaves the cell empty.
+        Arguments:
+            terminal: the terminal of the conflicting cell
+            storedAction: the action already in the cell
+            newAction: the action being inserted
+        Returns:
+            the action to keep, ERROR_CELL to leave the cell empty,
+            or None if the conflict can't be resolved
+        '''
+        actionTypes = {storedAction[0], newAction[0]}
+        if actionTypes != {SHIFT, REDUCE}:
+            return None
+
+        shiftAction, reduceAction = storedAction, newAction
+        if storedAction[0] == REDUCE:
+            shiftAction, reduceAction = newAction, storedAction
+
+        terminalPrecedence = self.grammar.terminalPrecedences.get(terminal)
+        productionPrecedence = self.grammar.productionPrecedences[reduceAction[1]]
+        if terminalPrecedence is None or productionPrecedence is None:
+            return None
+
+        if productionPrecedence[0] > terminalPrecedence[0]:
+            return reduceAction
+        if productionPrecedence[0] < terminalPrecedence[0]:
+            return shiftAction
+
+        associativity = terminalPrecedence[1]
+        if associativity == LEFT:
+            return reduceAction
+        if associativity == RIGHT:
+            return shiftAction
+        return ERROR_CELL
+
+    def describeAction(self, itemIndex, terminal, action):
+        '''
+        Returns a description of an action and the productions of the
+        item that cause it, used to report conflicts.
+        Arguments:
+            itemIndex: the index of the item
+            terminal: the terminal the action is taken under
+            action: a tuple with the action type and its parameter
+        Returns:
+            a string
+        '''
+        actionType = action[0]
+        actionParameter = action[1]
+        if actionType == SHIFT:
+            terminalId = self.grammar.symbolIds[terminal]
+            shiftedProductions = []
+            for productionWithDot in self.itemProductions[itemIndex]:
+                if productionWithDot.underlined() == terminalId:
+                    shiftedProductions.append(f"[{productionWithDot}]")
+            return f"shift {actionParameter} for " + ", ".join(shiftedProductions)
+
+        production = " ".join(self.grammar.augmentedProductions[actionParameter or 0])
+        if actionType == ACCEPT:
+            return f"accept for [{production}]"
+        return f"reduce {actionParameter} by [{production}]"
+
+    def storeShiftActions(self):
+        '''
+        Stores a shift action for every transition under a terminal.
+        '''
+        for itemIndex in range(self.numberOfItems()):
+            self.itemActions.append(dict())
+            for symbol in self.itemTransitions[itemIndex].keys():
+                if symbol in self.grammar.terminals:
+                    terminal = symbol
+                    destinationIndex = self.itemTransitions[itemIndex][terminal]
+                    self.itemActions[itemIndex][terminal] = (SHIFT, destinationIndex)
+
+    def reduceLookaheads(self, itemIndex, productionWithDot):
+        '''
+        Returns the terminals under which a completed production
+        is reduced: the follows of its header.
+        Arguments:
+            itemIndex: the index of the item with the production
+            productionWithDot: a completed production with dot
+        Returns:
+            a list of terminals
+        '''
+        production = productionWithDot.getProduction()
+        follows = self.firstFollow.follows[header(production)]
+        return bitsetMembers(follows, self.firstFollow.bitTerminals)
+
+    def storeReduceActions(self):
+        '''
+        Stores the reduce and accept actions of the completed productions.
+        '''
+        for itemIndex in range(self.numberOfItems()):
+            for productionWithDot in self.itemProductions[itemIndex]:
+                if productionWithDot.completed():
+                    productionIndex = productionWithDot.productionId
+
+                    if productionIndex == 0:
+                        self.insertAction(itemIndex, EOF, (ACCEPT, None))
+                    else:
+                        for lookahead in self.reduceLookaheads(itemIndex, productionWithDot):
+                            self.insertAction(itemIndex, lookahead, (REDUCE, productionIndex))
+
+    def getDenseTables(self, bypassUnitReductions = False):
+        '''
+        Returns the table packed into integer arrays,
+        building them the first time they are needed.
+        Arguments:
+            bypassUnitReductions: True for tables whose gotos skip
+                unit reduction chains
+        Returns:
+            a DenseTables object
+        '''
+        if bypassUnitReductions not in self.denseTables:
+            self.denseTables[bypassUnitReductions] = DenseTables(self, bypassUnitReductions)
+        return self.denseTables[bypassUnitReductions]
+
+    def getCompressedTables(self, bypassUnitReductions = False):
+        '''
+        Returns the table compressed into integer arrays, building them
+        the first time they are needed. The dense tables they are built
+        from are not kept unless they had been built already.
+        Arguments:
+            bypassUnitReductions: True for tables whose gotos skip
+                unit reduction chains
+        Returns:
+            a CompressedTables object
+        '''
+        if bypassUnitReductions not in self.compressedTables:
+            denseTables = self.denseTables.get(bypassUnitReductions)
+            if denseTables is None:
+                denseTables = DenseTables(self, bypassUnitReductions)
+            self.compressedTables[bypassUnitReductions] = CompressedTables(denseTables)
+        return self.compressedTables[bypassUnitReductions]
@@ -0,0 +1,82 @@
+# Storage of compiled tables in a directory, keyed by grammar hash,
+# so that a grammar's table is only built once
+
+import os
+import pickle
+import zlib
+
+from .slr_table import SLRTable, TableConflictError
+
+TABLES_FORMAT_VERSION = 4
+TABLES_FILE_EXTENSION = ".slr"
+
+def getTablePath(cacheDir, grammar, tableClass = SLRTable):
+    '''
+    Returns the route of the file with the compiled table of a grammar.
+    Arguments:
+        cacheDir: the directory of the cache
+        grammar: a Grammar object
+        tableClass: the class of the table
+    Returns:
+        the route of the file as a string
+    '''
+    tableType = tableClass.TABLE_TYPE.lower()
+    fileName = f"{grammar.getHash()}.{tableType}.v{TABLES_FORMAT_VERSION}{TABLES_FILE_EXTENSION}"
+    return os.path.join(cacheDir, fileName)
+
+def loadTable(path):
+    '''
+    Loads a compiled table from a compressed binary file.
+    Arguments:
+        path: the route of the file
+    Returns:
+        the table object if the file exists,
+        None otherwise
+    '''
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as tablesFile:
+        return pickle.loads(zlib.decompress(tablesFile.read()))
+
+def storeTable(path, table):
+    '''
+    Stores a compiled table in a compressed binary file.
+    The file is written under a temporary name and then moved into
+    place so that concurrent runs never read a partial file.
+    Arguments:
+        path: the route of the file
+        table: the table object
+    '''
+    directory = os.path.dirname(path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    temporaryPath = f"{path}.{os.getpid()}.tmp"
+    with open(temporaryPath, "wb") as tablesFile:
+        serializedTable = pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL)
+        tablesFile.write(zlib.compress(serializedTable))
+    os.replace(temporaryPath, path)
+
+def loadOrBuildTable(grammar, cacheDir = None, tableClass = SLRTable, collectConflicts = False):
+    '''
+    Returns the analysis table of a grammar, loading it from the cache
+    directory if it was stored there, or building and storing it otherwise.
+    Arguments:
+        grammar: a Grammar object
+        cacheDir: the directory of the cache, None to always build the table
+        tableClass: the class of the table, SLRTable or one of its subclasses
+        collectConflicts: True to record the table's conflicts instead of
+            raising a TableConflictError on the first one
+    Returns:
+        a table object of the given class
+    '''
+    if cacheDir is None:
+        return tableClass(grammar, collectConflicts=collectConflicts)
+
+    path = getTablePath(cacheDir, grammar, tableClass)
+    table = loadTable(path)
+    if table is not None and len(table.conflicts) > 0 and not collectConflicts:
+        raise TableConflictError(table.conflicts[0].getErrorMessage())
+    if table is None:
+        table = tableClass(grammar, collectConflicts=collectConflicts)
+        storeTable(path, table)
+    return table
@@ -0,0 +1,44 @@
+# Runs a parse server that keeps compiled SLR tables in memory and
+# answers parse requests, see grammar_analysis/server.py for the protocol
+
+# usage: $python parse_server.py [--host <host>] [--port <port>]
+#        [--unix-socket <route>] [--cache-dir <directory>]
+
+import argparse
+import asyncio
+
+from grammar_analysis.server import GrammarRegistry, ParseServer
+
+def getArguments():
+    '''
+    Reads the command line options.
+    Returns:
+        the namespace with the value of each option
+    '''
+    argumentParser = argparse.ArgumentParser(
+        description="Keeps compiled grammars in memory and parses token strings on request.")
+    argumentParser.add_argument("--host", default="127.0.0.1",
+        help="TCP host to listen on")
+    argumentParser.add_argument("--port", type=int, default=7878,
+        help="TCP port to listen on")
+    argumentParser.add_argument("--unix-socket", default=None,
+        help="route of a Unix socket to listen on instead of TCP")
+    argumentParser.add_argument("--cache-dir", default=None,
+        help="directory where compiled tables are stored and reused, keyed by grammar hash")
+    return argumentParser.parse_args()
+
+async def run(arguments):
+    parseServer = ParseServer(GrammarRegistry(arguments.cache_dir))
+    server = await parseServer.serve(arguments.host, arguments.port, arguments.unix_socket)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    arguments = getArguments()
+    try:
+        asyncio.run(run(arguments))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
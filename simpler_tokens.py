@@ -6,6 +6,8 @@
 # Author: Adolfo Acosta Castro [A01705249]
 # Date: 2022/09/09
 
+from grammar_analysis import Grammar
+
 def printSet(set):
     """
     Creates a string made of the elements of a set separated by commas
@@ -20,37 +22,12 @@ def printSet(set):
         resultString += item + SEPARATOR
     return resultString[:-len(SEPARATOR)]
 
-def parseLine(line, headerTokens, bodyTokens):
-    """
-    Takes the head and production tokens from one grammar production
-    and adds them to their respective sets
-    Arguments:
-        line: a string representing a grammar production
-        headerTokens: a set for the tokens on production headers
-        bodyTokens: a set for the tokens on production bodies
-    """
-    tokens = line.split()
-    headerTokens.add(tokens[0])
-    for i in range(2, len(tokens)):
-        if tokens[i] == '\'':
-            continue
-        bodyTokens.add(tokens[i])
-
-
-n = int(input().strip())
-
-headerTokens = set()
-bodyTokens = set()
-
-# Process each production one by one
-for i in range(n):
-    line = input().strip()
-    parseLine(line, headerTokens, bodyTokens)
+def main():
+    n = int(input().strip())
+    grammar = Grammar.fromLines(input() for i in range(n))
 
-# If a token appears on a production header then it is not terminal
-# even if it appears on a production body
-for token in headerTokens:
-    bodyTokens.discard(token)
+    print(f"Terminal: {printSet(grammar.terminals)}")
+    print(f"Non terminal: {printSet(grammar.nonTerminals)}")
 
-print(f"Terminal: {printSet(bodyTokens)}")
-print(f"Non terminal: {printSet(headerTokens)}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,796 +1,454 @@
 # Generates a SLR analysis table and uses it to try and parse strings
 # The results are printed as tables in an HTML document
 
-# usage: $python SLR.py < <input file> > <output file>
+# usage: $python SLR.py [--table-type slr|lalr|lr1|canonical-lr1|auto] [--table-report]
+#        [--collect-conflicts] [--cache-dir <directory>] [--dense-tables] [--compressed-tables]
+#        [--quiet] [--parse-trees | --actions <python file> | --recover] [--sync-terminals <terminals>]
+#        [--keep-unit-reductions] [--jobs <n>]
+#        [--lexer <token definitions file> | --literal-lexer]
+#        < <input file> > <output file>
 
-# Author: Adolfo Acosta Castro [A01705249]
-# Date: 2022/10/31
-
-import sys
-
-EPSILON = '\' \''
-EOF ='$'
-DOT = "•"
-SHIFT = "S"
-REDUCE = "R"
-ACCEPT = "AC"
-UNIQUE_TOKEN = "A01705249"
-BODY_START_INDEX = 2
-STYLESHEET = "styles.css"
-ERROR = 0
-MESSAGE = 1
-
-class Queue:
-    """
-    A simple FIFO queue data structure built
-    space-inefficiently on top of a list.
-    """
-    values = []
-    frontIndex = 0
-
-    def insert(self, value):
-        self.values.append(value)   
-
-    def remove(self):
-        value = self.values[self.frontIndex]
-        self.frontIndex += 1
-        return value
-
-    def empty(self):
-        return (self.frontIndex == len(self.values))
-
-class ProductionWithDot:
-    '''
-    A grammar production with a marker (dot) that
-    can be moved between the body's symbols.
-    '''
-    production = None
-    dotIndex = None # Index of symbol that is right after the dot
-
-    def __init__(self, production, dotIntex = 2):
-        self.production = production
-        self.dotIndex = dotIntex
-
-    def underlined(self):
-        '''
-        Returns the symbol after the dot or None 
-        if dot is at the end of the production.
-        '''
-        if not self.completed():
-            return self.production[self.dotIndex]
-        else:
-            return None
-
-    def advanceDot(self):
-        '''
-        Returns a copy of the object with the 
-        dot one positiono ahead.
-        '''
-        advancedProduction = ProductionWithDot(self.production, self.dotIndex + 1)
-        return advancedProduction
-
-    def completed(self):
-        '''
-        Returns true if the dot has advanced to 
-        the end of the production's body.
-        '''
-        if self.production[BODY_START_INDEX] == EPSILON:
-            return True
-        return (not self.dotIndex < len(self.production))
-
-    def getProduction(self):
-        '''
-        Returns the object's production.
-        '''
-        return self.production
-
-    def __eq__(self, other):
-        if isinstance(other, ProductionWithDot):
-            return (self.production == other.production and
-                    self.dotIndex == other.dotIndex)
-        else:
-            return False
-
-    def __ne__(self, other):
-        return (not self.__eq__(other))
-
-    def __hash__(self):
-        productionWithDotTuple = (tuple(self.production), self.dotIndex)
-        return hash(productionWithDotTuple)
+# The grammar's lines can declare the precedence and associativity of
+# terminals, like "%left + -", to resolve conflicts of ambiguous grammars;
+# they are counted among the productions
 
-    def __str__(self):
-        separator = " "
-        stringRep = separator.join(self.production[:self.dotIndex])
-        stringRep += separator + DOT + separator
-        if not self.completed():
-            stringRep += separator.join(self.production[self.dotIndex:])
+# Strings are split on whitespace unless a lexer is used: a file with a
+# terminal and its regular expression per line, like "number [0-9]+",
+# or the grammar's terminals matched literally
 
-        return stringRep
+# Semantic actions are registered by a python file with a function
+# registerActions(semanticActions), called with a SemanticActions object
 
+# Author: Adolfo Acosta Castro [A01705249]
+# Date: 2022/10/31
 
-def header(production):
-    '''
-    Returns the header portion of a grammar's production.
-    Arguments:
-        production: a python list of tokens representing a well-formed production
-    Returns:
-        The production's header as a string
-    '''
-    return production[0]
-
-def body(production):
-    '''
-    Returns the body portion of a grammar's production.
-    Arguments:
-        production: a python list of tokens representing a well-formed production
+import argparse
+import importlib.util
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+
+from grammar_analysis import (EOF, CanonicalLR1Table, Grammar, LALRTable, Lexer, LexingError,
+    LR1Table, SemanticActions, SLRParser, SLRTable, TableConflictError, loadOrBuildTable)
+from grammar_analysis.batch import parseStrings
+from grammar_analysis.html_report import (getTableHeader, getTableRow, writeHtmlDocEnd,
+    writeHtmlDocStart, writeHtmlHeading, writeHtmlSection, writeParseProcess,
+    writeSlrTable, writeTableEnd, writeTableStart, writeTreeTable)
+from grammar_analysis.input_reader import readParseInput
+from grammar_analysis.slr_parser import getStackStringState
+
+TABLE_CLASSES = {
+    "slr": [SLRTable],
+    "lalr": [LALRTable],
+    "lr1": [LR1Table],
+    "canonical-lr1": [CanonicalLR1Table],
+    "auto": [SLRTable, LALRTable, LR1Table],
+}
+
+def getArguments():
+    '''
+    Reads the command line options.
     Returns:
-        The production's body as a list of tokens
-    '''
-    return production[2:]
-
-def bodyLength(production):
-    '''
-    Returns the number of tokens in the body of a production 
-    or 0 if the production only derives in epsilon.
+        the namespace with the value of each option
+    '''
+    argumentParser = argparse.ArgumentParser(
+        description="Generates a SLR analysis table and uses it to try and parse strings.")
+    argumentParser.add_argument("--cache-dir", default=None,
+        help="directory where compiled tables are stored and reused, keyed by grammar hash")
+    argumentParser.add_argument("--table-type", choices=TABLE_CLASSES.keys(), default="slr",
+        help="table to build: slr, lalr, lr1 (with merged items), canonical-lr1, "
+             "or auto to use the first of slr, lalr and lr1 without conflicts")
+    argumentParser.add_argument("--collect-conflicts", action="store_true",
+        help="report every conflict of the table to stderr and keep one action per cell, instead of stopping on the first")
+    argumentParser.add_argument("--table-report", action="store_true",
+        help="print the type, number of items and construction time of the table to stderr")
+    argumentParser.add_argument("--dense-tables", action="store_true",
+        help="parse with tables packed into integer arrays instead of dictionaries")
+    argumentParser.add_argument("--compressed-tables", action="store_true",
+        help="parse with tables compressed with default reductions and row displacement")
+    argumentParser.add_argument("--quiet", action="store_true",
+        help="only print whether each string is accepted and where it failed, instead of the HTML report")
+    outputOptions = argumentParser.add_mutually_exclusive_group()
+    outputOptions.add_argument("--parse-trees", action="store_true",
+        help="only print results like --quiet, with the parse tree of each accepted string as an s-expression")
+    outputOptions.add_argument("--actions", default=None,
+        help="only print results like --quiet, with the value of each accepted string computed by the "
+             "semantic actions of a python file, registered by its registerActions function")
+    outputOptions.add_argument("--recover", action="store_true",
+        help="only print results like --quiet, recovering from syntax errors to print every error of "
+             "each string, with the grammar's error productions or in panic mode")
+    argumentParser.add_argument("--sync-terminals", default=None,
+        help="with --recover, comma separated terminals that panic mode skips to, "
+             "instead of the follows of the non-terminals")
+    argumentParser.add_argument("--keep-unit-reductions", action="store_true",
+        help="perform the reductions by unit productions like A -> B when only printing results, "
+             "instead of skipping them")
+    argumentParser.add_argument("--jobs", type=int, default=1,
+        help="number of worker processes used to parse the strings, 0 uses every core")
+    lexerOptions = argumentParser.add_mutually_exclusive_group()
+    lexerOptions.add_argument("--lexer", default=None,
+        help="file with token definitions used to split the strings, a terminal and its regular expression per line")
+    lexerOptions.add_argument("--literal-lexer", action="store_true",
+        help="split the strings into the grammar's terminals, which don't need to be separated by whitespace")
+    arguments = argumentParser.parse_args()
+    if arguments.sync_terminals is not None and not arguments.recover:
+        argumentParser.error("argument --sync-terminals: only allowed with argument --recover")
+
+    # Options that print something for each string only print results
+    if arguments.parse_trees or arguments.actions is not None or arguments.recover:
+        arguments.quiet = True
+    return arguments
+
+def getTable(grammar, tableClasses, cacheDir, collectConflicts):
+    '''
+    Returns the first table of a grammar without conflicts, trying
+    each table class in order. When conflicts are collected and every
+    table has them, the last table is returned.
     Arguments:
-        production: a well-formed list of tokens
+        grammar: a Grammar object
+        tableClasses: a list of table classes, from the cheapest to build
+        cacheDir: the directory of the cache, None to always build the table
+        collectConflicts: True to record the conflicts of the tables
     Returns:
-        The length as specified above
+        a table object
     '''
-    if production[BODY_START_INDEX] == EPSILON:
-        return 0
-    return (len(production) - 2)
+    for tableClass in tableClasses:
+        try:
+            table = loadOrBuildTable(grammar, cacheDir, tableClass, collectConflicts)
+        except TableConflictError as error:
+            conflictError = error
+            continue
+        if len(table.conflicts) == 0:
+            return table
+    if collectConflicts:
+        return table
+    raise conflictError
 
-def top(stack, name):
+def getLexer(arguments, grammar):
     '''
-    Returns the top-most value of a stack. If the stack is empty,
-    it sets the parsing error data values.
+    Returns the lexer chosen in the command line options.
     Arguments:
-        stack: a python list, last element must be the top
-        name: a string representing a descriptive name for the stack
+        arguments: the namespace with the value of each option
+        grammar: a Grammar object
     Returns:
-        The element on the last position of the list if it exists
-        None otherwise
+        a Lexer object, None to split strings on whitespace
     '''
-    if not len(stack) > 0:
-        parsingErrorData[ERROR] = True
-        parsingErrorData[MESSAGE] = f"Error: tried to remove a token from the {name} but it was empty."
-        return None
-
-    return stack[-1]
+    if arguments.literal_lexer:
+        return Lexer.fromGrammar(grammar)
+    if arguments.lexer is not None:
+        with open(arguments.lexer, "r", encoding="utf-8") as definitionsFile:
+            return Lexer.fromLines(definitionsFile)
+    return None
 
-def firstsOfString(string):
+def getTokenList(line, lexer):
     '''
-    Return the set of firsts of a string.
+    Splits a string into the tokens to parse, ending with the end of
+    file token, with a lexer or on whitespace.
     Arguments:
-        string: a python list of grammar symbols
+        line: a string
+        lexer: a Lexer object, None to split the string on whitespace
     Returns:
-        The set of firsts for the sequence of symbols
-    '''
-    stringFirsts = set()
-    for i in range(len(string)):
-        if string[i] in nonTerminals:
-            nonTermFirsts = firsts[string[i]]
-            stringFirsts.update(nonTermFirsts)
-            stringFirsts.discard(EPSILON)
-            if not EPSILON in nonTermFirsts:
-                return stringFirsts
-        else:
-            stringFirsts.add(string[i])
-            return stringFirsts
-    stringFirsts.add(EPSILON)
-    return stringFirsts
-
-def markEpsilons(nonTerminal):
-    '''
-    Replaces all ocurrences of a non-terminal with epsilon in the 
-    bodies of productions for marking, and repeats recursively 
-    when a production that has only epsilon in its body is found.
-    Arguments:
-        nonTerminal: the non-terminal to replace
-    '''
-    for production in productionsForMarking:
-        bodyIsAllEpsilon = True
-        for i in range(BODY_START_INDEX, len(production)):
-            if production[i] == nonTerminal:
-                production[i] = EPSILON
-
-            if production[i] != EPSILON:
-                bodyIsAllEpsilon = False
-        
-        producingNonTerm = header(production)
-        if bodyIsAllEpsilon and EPSILON not in firsts[producingNonTerm]:
-            firsts[producingNonTerm].add(EPSILON)
-            markEpsilons(producingNonTerm)
-
-def propagateFirstsSeeds(nonTerminal, seeds):
-    '''
-    Uses the firsts dependency graph to propagate firsts
-    between non-terminals.
-    Arguments:
-        nonTerminal: a non-terminal to propagate to
-        seeds: a set of tokens to propagate
-    '''
-    if visited[nonTerminal]:
-        return
-    visited[nonTerminal] = True
-    firsts[nonTerminal].update(seeds)
-    for node in reverseFirstsDependencies[nonTerminal]:
-        propagateFirstsSeeds(node, seeds)
-
-def propagateFollowsSeeds(nonTerminal, seeds):
-    '''
-    Uses the follows dependency graph to propagate follows
-    between non-terminals.
-    Arguments:
-        nonTerminal: a non-terminal to propagate to
-        seeds: a set of tokens to propagate
-    '''
-    if visited[nonTerminal]:
-        return
-    visited[nonTerminal] = True
-    follows[nonTerminal].update(seeds)
-    for node in reverseFollowsDependencies[nonTerminal]:
-        propagateFollowsSeeds(node, seeds)
-
-def insertIntoDict(dictArray, index, key, value):
-    '''
-    Inserts a value in the specified position of an array of
-    dictionaries. If the position is already occupied then
-    it end the program with an error.
-    Arguments:
-        dictArray: a list of dictionaries
-        index: the index of the dictionary
-        key: the key for the dictionary
-        value: the value to try and insert
-    '''
-    if not key in dictArray[index].keys():
-        dictArray[index][key] = value
-    else:
-        sys.exit(f"Error: overlap in SLR table cell ({index}, \"{key}\").")
+        a list of tokens without a lexer, and with one a list with two
+        elements: the tokens read and the lexing error message, None
+        if there was no error
+    '''
+    if lexer is None:
+        tokenList = line.split()
+        tokenList.append(EOF)
+        return tokenList
+
+    tokenList = []
+    lexingErrorMessage = None
+    try:
+        for terminal in lexer.terminals(line):
+            tokenList.append(terminal)
+    except LexingError as error:
+        lexingErrorMessage = str(error)
+    tokenList.append(EOF)
+    return (tokenList, lexingErrorMessage)
 
-def retrieveFromDict(dictArray, index, key):
+def getTextRecognizer(parser, lexer):
     '''
-    Retrieves a value from the specified position of an array of
-    dictionaries. If the position doesn't contain any values then
-    it sets the parsing error data values.
+    Returns a function that lexes a string and recognizes its tokens as
+    they are produced, reporting lexing errors like parsing errors.
     Arguments:
-        dictArray: a list of dictionaries
-        index: the index of the dictionary
-        key: the key for the dictionary
+        parser: an SLRParser object
+        lexer: a Lexer object
     Returns:
-        The value from the array if dictionaries if available,
-        None otherwise
-    '''
-    if key in dictArray[index].keys():
-        return dictArray[index][key]
-    else:
-        parsingErrorData[ERROR] = True
-        parsingErrorData[MESSAGE] = f"Error: a required table value ({index}, \"{key}\"), doesn't exist."
-        return None
-
-def checkTokenInGrammar(token):
-    '''
-    Validates that a token from an input string
-    is a terminal or the end of file token.
-    In case of an error, it sets the parsing error data values.
+        a function from a string to a recognize result
+    '''
+    def recognizeText(text):
+        tokensRead = 0
+        def countedTerminals():
+            nonlocal tokensRead
+            for terminal in lexer.terminals(text):
+                tokensRead += 1
+                yield terminal
+        try:
+            return parser.recognize(countedTerminals())
+        except LexingError as error:
+            return (tokensRead + 1, str(error))
+    return recognizeText
+
+def getTreeBuilder(parser, lexer):
+    '''
+    Returns a function that builds the parse tree of a string,
+    split with a lexer or on whitespace, and serializes it.
     Arguments:
-        token: the token to validate
-    '''
-    if token not in actionSymbols:
-        parsingErrorData[ERROR] = True
-        parsingErrorData[MESSAGE] = f"Error: input string has a symbol (\"{token}\") that is not recognized by the grammar."
-
-def getStackStringState(stack, string):
-    '''
-    Returns a list with two elements: the contents of the stack and
-    the contents of an input string used in a parsing process, as strings.
-    Arguments:
-        stack: a list used as a stack when parsing a string
-        string: a list managed as a stack
+        parser: an SLRParser object
+        lexer: a Lexer object, None to split strings on whitespace
     Returns:
-        a list as described above
-    '''
-    return [" ".join(map(str, stack)), " ".join(map(str, reversed(string)))]
-
-def getSlrTableHeader(terminalsArray, nonTerminalsArray):
-    '''
-    Returns a string representing the header of the SLR table
-    with HTML format.
+        a function from a string to a list with three elements: the
+        position of the token where the parsing failed and an error
+        message, like a recognize result, and the tree as an s-expression,
+        None if the string is not accepted
+    '''
+    def buildTreeText(text):
+        lexemes = []
+        def readTerminals():
+            if lexer is None:
+                for token in text.split():
+                    lexemes.append(token)
+                    yield token
+                return
+            for terminal, lexeme, position in lexer.tokenize(text):
+                lexemes.append(lexeme)
+                yield terminal
+        try:
+            tree, errorPosition, errorMessage = parser.buildTree(readTerminals())
+        except LexingError as error:
+            return (len(lexemes) + 1, str(error), None)
+        if tree is None:
+            return (errorPosition, errorMessage, None)
+        return (None, None, tree.toSExpression(lexemes))
+    return buildTreeText
+
+def getSemanticActions(actionsPath, grammar):
+    '''
+    Loads a python file and lets its registerActions function register
+    the semantic actions of a grammar.
     Arguments:
-        terminalsArray: a list of terminals for the actions section
-        nonTerminals: a list of non-terminals for the goto section
+        actionsPath: the route of the file
+        grammar: a Grammar object
     Returns:
-        a string with HTML format
+        a SemanticActions object
     '''
-    headerTitles = f"\t<th> </th>\n"
-    headerTitles += f"\t<th colspan = {len(terminalsArray)}> ACTIONS </th>\n"
-    headerTitles += f"\t<th colspan = {len(nonTerminalsArray)}> GOTO </th>\n"
-    headerTitles = "<tr>\n" + headerTitles + "</tr>\n"
-
-    headerSymbols = f"\t<th> </th>\n"
-    for symbol in terminalsArray + nonTerminalsArray:
-        headerSymbols += f"\t<th> {symbol} </th>\n"
-    headerSymbols = "<tr>\n" + headerSymbols + "</tr>"
+    moduleSpec = importlib.util.spec_from_file_location("semantic_actions_module", actionsPath)
+    if moduleSpec is None:
+        raise ImportError(f"can't load \"{actionsPath}\"")
+    actionsModule = importlib.util.module_from_spec(moduleSpec)
+    moduleSpec.loader.exec_module(actionsModule)
 
-    return (headerTitles + headerSymbols)
-
-def getTableHeader(headers):
-    '''
-    Returns a string representing the header of a simple table
-    with HTML format.
-    Arguments:
-        headers: a list of strings for the header of each column
-    Returns:
-        a string with HTML format
-    '''
-    headerCells = ""
-    for title in headers:
-        headerCells += f"\t<th> {title} </th>\n"
-    tableHeader = "<tr>\n" + headerCells + "</tr>\n"
-    return tableHeader
+    semanticActions = SemanticActions(grammar)
+    actionsModule.registerActions(semanticActions)
+    return semanticActions
 
-def getTreeTableRow(itemIndex, cellLists):
+def getEvaluator(parser, lexer, semanticActions):
     '''
-    Returns a string representing a row of the SLR item tree table
-    with HTML format.
+    Returns a function that evaluates a string with semantic actions,
+    split with a lexer or on whitespace, where the value of each token
+    is its lexeme.
     Arguments:
-        itemIndex: an integer, the id of a tree item
-        cellLists: a lists of lists, one list to be included per cell
+        parser: an SLRParser object
+        lexer: a Lexer object, None to split strings on whitespace
+        semanticActions: a SemanticActions object
     Returns:
-        a string with HTML format
-    '''
-    rowCells = f"\t<td> {itemIndex} </td>\n"
-    for cellList in cellLists:
-        rowCells += f"\t<td class=\"list_cell\">\n"
-        rowCells += f"\t\t<ul>\n"
-        for value in cellList:
-            rowCells += f"\t\t\t<li> {value} </li>\n"
-        rowCells += f"\t\t</ul>\n"
-        rowCells += f"\t</td>\n"
-    tableRow = "<tr>\n" + rowCells + "</tr>\n"
-    return tableRow
-
-def getTableRow(cellValues):
-    '''
-    Returns a string representing a row of the SLR table
-    with HTML format.
+        a function from a string to a list with three elements: the
+        position of the token where the parsing failed and an error
+        message, like a recognize result, and the value of the string
+    '''
+    def evaluateText(text):
+        tokensRead = 0
+        def readTokens():
+            nonlocal tokensRead
+            if lexer is None:
+                tokens = ((token, token) for token in text.split())
+            else:
+                tokens = lexer.tokenize(text)
+            for token in tokens:
+                tokensRead += 1
+                yield token
+        try:
+            value, errorPosition, errorMessage = parser.evaluate(readTokens(), semanticActions)
+        except LexingError as error:
+            return (tokensRead + 1, str(error), None)
+        return (errorPosition, errorMessage, value)
+    return evaluateText
+
+def getRecoveringRecognizer(parser, lexer, synchronizingTerminals):
+    '''
+    Returns a function that recognizes a string recovering from its
+    syntax errors, split with a lexer or on whitespace. A lexing error
+    ends the string, after the errors of the tokens before it.
     Arguments:
-        cellValues: a list of values for each cell
+        parser: an SLRParser object
+        lexer: a Lexer object, None to split strings on whitespace
+        synchronizingTerminals: a set of terminals, None to synchronize
+            with the follows of the non-terminals
     Returns:
-        a string with HTML format
+        a function from a string to a list of pairs of error position and message
     '''
-    rowCells = ""
-    for value in cellValues:
-        rowCells += f"\t<td> {value} </td>\n"
-    tableRow = "<tr>\n" + rowCells + "</tr>\n"
-    return tableRow
+    def recognizeRecovering(text):
+        if lexer is None:
+            return parser.recognizeWithRecovery(text.split(), synchronizingTerminals)
 
-def getTable(header, rows):
-    '''
-    Returns a string representing a full SLR table
-    with HTML format.
-    Arguments:
-        header: an HTML string representing a table header
-        rows: a list of HTML string representing table rows
-    Returns:
-        a string with HTML format
-    '''
-    table = "<table>\n"
-    table += header
-    for row in rows:
-        table += row
-    table += "</table>\n"
-    return table
-
-def getHtmlDoc(headings, bodyElements):
+        tokenList, lexingErrorMessage = getTokenList(text, lexer)
+        tokenList.pop()
+        errors = parser.recognizeWithRecovery(tokenList, synchronizingTerminals)
+        if lexingErrorMessage is not None:
+            errors = [error for error in errors if error[0] <= len(tokenList)]
+            errors.append((len(tokenList) + 1, lexingErrorMessage))
+        return errors
+    return recognizeRecovering
+
+def getTextParser(parser):
     '''
-    Returns a string representing a full HTML document with content
-    and link to a stylesheet.
+    Returns a function that parses lexed strings, reporting lexing errors
+    as a single step with the tokens read before them.
     Arguments:
-        headings: a list of strings to use as h1 content for each body element
-        bodyElements: a list of HTML strings representing HTML elements
+        parser: an SLRParser object
     Returns:
-        a string with HTML format
-    '''
-    doc = "<!DOCTYPE html>\n"
-    doc += "<html>\n"
-    doc += "<head>\n"
-    doc += f"\t<link rel=\'stylesheet\' href=\'{STYLESHEET}\'>\n"
-    doc += "\t<title> SLR table </title>\n"
-    doc += "</head>\n"
-    doc += "<body>\n"
-    for i in range(len(bodyElements)):
-        doc += f"<h1>{headings[i]}</h1>\n"
-        doc += f"{bodyElements[i]}\n"
-    doc += "</body>\n"
-    doc += "</html>\n"
-    return doc
-
-
-
-#---------------------------------------------------------------
-# Parse input into lists of tokens and lists of symbols
-#---------------------------------------------------------------
-productions = []
-nonTerminals = set()
-terminals = set()
-startNonTerm = None
-
-inputNumbers = input().strip().split()
-numberOfProductions = int(inputNumbers[0])
-numberOfStrings = int(inputNumbers[1])
-
-for i in range(numberOfProductions):
-    line = input().strip()
-
-    # Store each production as a list of tokens
-    production = line.split()
-    if production[2] == '\'' and production[3] == '\'':
-        production.pop()
-        production.pop()
-        production.append(EPSILON)
-    productions.append(production)
-
-    # Store all non-terminals
-    nonTerminal = header(production)
-    nonTerminals.add(nonTerminal)
-
-startNonTerm = header(productions[0])
-
-# Get set of terminals and symbols
-for production in productions:
-    for token in body(production):
-        if token not in nonTerminals and token != EPSILON:
-            terminals.add(token)
-symbols = terminals.union(nonTerminals)
-
-
-
-#---------------------------------------------------------------
-# Calculate firsts and follows sets
-#---------------------------------------------------------------
-productionsForMarking = []
-firsts = dict()
-firstsSeeds = dict()
-reverseFirstsDependencies = dict()
-
-follows = dict()
-followsSeeds = dict()
-reverseFollowsDependencies = dict()
-
-visited = dict()
-
-# Initialize sets used for firsts and follows for each non-terminal
-for nonTerminal in nonTerminals:
-    firsts[nonTerminal] = set()
-    firstsSeeds[nonTerminal] = set()
-    reverseFirstsDependencies[nonTerminal] = set()
-
-    follows[nonTerminal] = set()
-    followsSeeds[nonTerminal] = set()
-    reverseFollowsDependencies[nonTerminal] = set()
-
-    visited[nonTerminal] = set()
-
-# Find which non-terminals have epsilon in their firsts
-for production in productions:
-    productionsForMarking.append(production.copy())
-
-for production in productionsForMarking:
-    nonTerminal = header(production)
-    if production[BODY_START_INDEX] == EPSILON and EPSILON not in firsts[nonTerminal]:
-        firsts[nonTerminal].add(EPSILON)
-        markEpsilons(nonTerminal)
-
-# Build firsts dependency graph and find firsts seeds
-for production in productions:
-    if production[BODY_START_INDEX] == EPSILON:
-        continue
-
-    nonTerminal = header(production)
-    for i in range(BODY_START_INDEX, len(production)):
-        token = production[i]
-        if token in nonTerminals:
-            reverseFirstsDependencies[token].add(nonTerminal)
-            if EPSILON not in firsts[token]:
-                break
+        a function from a pair of a token list and a lexing error message,
+        None if there was no error, to a parse result
+    '''
+    def parseText(lexedString):
+        tokenList, lexingErrorMessage = lexedString
+        if lexingErrorMessage is None:
+            return parser.parse(tokenList)
+        parseCellValues = getStackStringState([0], list(reversed(tokenList)))
+        parseCellValues.append(lexingErrorMessage)
+        return ([parseCellValues], f"Unaccepted. {lexingErrorMessage}")
+    return parseText
+
+def main():
+    arguments = getArguments()
+
+    # Parse input into a grammar, the strings are read as they are parsed
+    productionLines, stringLines = readParseInput(sys.stdin)
+    grammar = Grammar.fromLines(productionLines)
+
+    # Build the analysis table, or load it if it was cached
+    startTime = time.perf_counter()
+    try:
+        table = getTable(grammar, TABLE_CLASSES[arguments.table_type], arguments.cache_dir,
+                         arguments.collect_conflicts)
+    except TableConflictError as error:
+        sys.exit(str(error))
+
+    for conflict in table.conflicts:
+        print(f"Warning: {conflict}", file=sys.stderr)
+    if len(table.conflicts) > 0:
+        print(f"Warning: {len(table.conflicts)} conflicts in {table.TABLE_TYPE} table.", file=sys.stderr)
+
+    if arguments.table_report:
+        constructionTime = time.perf_counter() - startTime
+        print(f"{table.TABLE_TYPE} table: {table.numberOfItems()} items, "
+              f"built in {constructionTime:.3f} s", file=sys.stderr)
+        denseCells = table.getDenseTables().numberOfCells()
+        compressedCells = table.getCompressedTables().numberOfCells()
+        print(f"Dense tables: {denseCells} cells, compressed tables: {compressedCells} cells",
+              file=sys.stderr)
+
+    parser = SLRParser(table, dense=arguments.dense_tables, compressed=arguments.compressed_tables,
+                       keepUnitReductions=arguments.keep_unit_reductions)
+    try:
+        lexer = getLexer(arguments, grammar)
+    except (OSError, ValueError, re.error) as error:
+        sys.exit(f"Error: invalid token definitions. {error}")
+
+    # Only report the result of each string, parsing them as they are read.
+    # The packed tables each driver uses are built before parsing, so
+    # that worker processes share them instead of building their own
+    if arguments.parse_trees or arguments.actions is not None:
+        if arguments.parse_trees:
+            parser.getPackedTables()
+            stringFunction = getTreeBuilder(parser, lexer)
         else:
-            firstsSeeds[nonTerminal].add(token)
-            break
-
-# Propagate firsts seeds
-for nonTerminal in nonTerminals:
-    if len(firstsSeeds[nonTerminal]) > 0:
-        for node in visited:
-            visited[node] = False
-        propagateFirstsSeeds(nonTerminal, firstsSeeds[nonTerminal])
-
-# Build follows dependency graph and find follows seeds
-followsSeeds[startNonTerm].add(EOF)
-for production in productions:
-    for i in range(BODY_START_INDEX, len(production)):
-        token = production[i]
-        if token in nonTerminals:
-            if i < len(production) - 1:
-                betaFirsts = firstsOfString(production[i + 1:])
-                followsSeeds[token].update(betaFirsts)
-                followsSeeds[token].discard(EPSILON)
-                if EPSILON in betaFirsts:
-                    reverseFollowsDependencies[header(production)].add(token)
+            try:
+                semanticActions = getSemanticActions(arguments.actions, grammar)
+            except (OSError, ImportError, AttributeError, ValueError) as error:
+                sys.exit(f"Error: invalid semantic actions. {error}")
+            parser.getPackedTables(parser.evaluationBypassesUnitReductions(semanticActions))
+            stringFunction = getEvaluator(parser, lexer, semanticActions)
+
+        results = parseStrings(stringFunction, stringLines, arguments.jobs)
+        for i, (errorPosition, errorMessage, result) in enumerate(results):
+            if errorPosition is None:
+                print(f"{i + 1}\tAccepted.\t{result}")
             else:
-                reverseFollowsDependencies[header(production)].add(token)
-
-# Propagate follows seeds
-for nonTerminal in nonTerminals:
-    if len(followsSeeds[nonTerminal]) > 0:
-        for node in visited:
-            visited[node] = False
-        propagateFollowsSeeds(nonTerminal, followsSeeds[nonTerminal])
-
-
-
-#---------------------------------------------------------------
-# Generate item tree and SLR table
-#---------------------------------------------------------------
-
-# Make dictionary of productions organized by non-terminal 
-productionsOf = dict()
-for nonTerminal in nonTerminals:
-    productionsOf[nonTerminal] = []
-
-for production in productions:
-    nonTerminal = header(production)
-    productionsOf[nonTerminal].append(production)
-
-# Create new production that recognizes the grammar
-artificialProduction = [UNIQUE_TOKEN, "->", startNonTerm]
-productions.insert(0, artificialProduction)
-
-# Insert new production into kernel of item 0
-itemKernels = []
-itemProductions = []
-itemTransitions = []
-itemQueue = Queue()
-
-initialKernel = {ProductionWithDot(artificialProduction)}
-
-itemKernels.append(initialKernel)
-newItemIndex = len(itemKernels) - 1
-itemQueue.insert(newItemIndex)
-
-# Build item tree, breath first traversal
-treeTableRows = []
-while not itemQueue.empty():
-    itemIndex = itemQueue.remove()
-
-    treeCellValues = []
-
-    # Duplicate productions from kernel into list for convenience
-    itemProductions.append([])
-    for productionWithDot in itemKernels[itemIndex]:
-        itemProductions[itemIndex].append(productionWithDot)
-    treeCellValues.append(itemKernels[itemIndex])
-
-    # Add productions of non-terminals with dot before them to item
-    i = 0
-    while i < len(itemProductions[itemIndex]):
-        productionWithDot = itemProductions[itemIndex][i]
-        underlinedSymbol = productionWithDot.underlined()
-        if underlinedSymbol in nonTerminals:
-            for production in productionsOf[underlinedSymbol]:
-                newProductionWithDot = ProductionWithDot(production)
-                if newProductionWithDot not in itemProductions[itemIndex]:
-                    itemProductions[itemIndex].append(newProductionWithDot)
-        i += 1  
-    treeCellValues.append(itemProductions[itemIndex])
-
-    # Derive for each terminal and non-terminal
-    itemTransitions.append(dict())
-    transitionsStrings = []
-
-    for symbol in symbols:
-        derivedKernel = set()
-        for productionWithDot in itemProductions[itemIndex]:
-            if productionWithDot.underlined() == symbol:
-                advancedProduction = productionWithDot.advanceDot()
-                derivedKernel.add(advancedProduction)
-
-        if len(derivedKernel) == 0:
-            continue
+                print(f"{i + 1}\tUnaccepted at token {errorPosition}. {errorMessage}")
+        return
 
-        destinationIndex = -1
-        if not derivedKernel in itemKernels:
-            # Create brand new item
-            itemKernels.append(derivedKernel)
-            newItemIndex = len(itemKernels) - 1
-            itemQueue.insert(newItemIndex)
-            destinationIndex = newItemIndex
-        else:
-            oldItemIndex = itemKernels.index(derivedKernel)
-            destinationIndex = oldItemIndex
-
-        # Store transitions between items
-        itemTransitions[itemIndex][symbol] = destinationIndex
-        transitionsStrings.append(f"Under {symbol} moves to {destinationIndex}")
-      
-    treeCellValues.append(transitionsStrings)
-    treeTableRow = getTreeTableRow(itemIndex, treeCellValues)
-    treeTableRows.append(treeTableRow)
-
-treeTableHeader = getTableHeader(["Item", "Kernel", "Whole list", "Transitions"])
-treeTable = getTable(treeTableHeader, treeTableRows)
-
-# Store shift actions
-itemActions = []
-for itemIndex in range(len(itemKernels)):
-    itemActions.append(dict())
-    for symbol in itemTransitions[itemIndex].keys():
-        if symbol in terminals:
-            terminal = symbol
-            destinationIndex = itemTransitions[itemIndex][terminal]
-            itemActions[itemIndex][terminal] = (SHIFT, destinationIndex)
-
-# Store reduce and accepted actions
-for itemIndex in range(len(itemKernels)):
-    for productionWithDot in itemProductions[itemIndex]:
-        if productionWithDot.completed():
-            production = productionWithDot.getProduction()
-            productionIndex = productions.index(production)
-            
-            if productionIndex == 0:
-                insertIntoDict(itemActions, itemIndex, EOF, (ACCEPT, None))
-            else:
-                for follow in follows[header(production)]:
-                    insertIntoDict(itemActions, itemIndex, follow, (REDUCE, productionIndex))
-               
-
-#---------------------------------------------------------------
-# Build HTML SLR table
-#---------------------------------------------------------------
-nonTerminalsArray = []
-for nonTerminal in nonTerminals:
-    nonTerminalsArray.append(nonTerminal)
-nonTerminalsArray.sort()
-
-terminalsArray = []
-for terminal in terminals:
-    terminalsArray.append(terminal)
-terminalsArray.sort()
-terminalsArray.append(EOF)
-
-slrTableRows = []
-
-for itemIndex in range(len(itemKernels)):
-    cellValues = [itemIndex]
-    for terminal in terminalsArray:
-        if terminal in itemActions[itemIndex].keys():
-            actionType = itemActions[itemIndex][terminal][0]
-            actionParameter = itemActions[itemIndex][terminal][1]
-            if actionType == ACCEPT:
-                actionParameter = ""
-            cellValues.append(f"{actionType}{actionParameter}")
-        else:
-            cellValues.append("")
+    if arguments.recover:
+        synchronizingTerminals = None
+        if arguments.sync_terminals is not None:
+            synchronizingTerminals = set(arguments.sync_terminals.split(","))
+        parser.getPackedTables(not parser.keepUnitReductions)
+        stringFunction = getRecoveringRecognizer(parser, lexer, synchronizingTerminals)
+        results = parseStrings(stringFunction, stringLines, arguments.jobs)
+        for i, errors in enumerate(results):
+            if len(errors) == 0:
+                print(f"{i + 1}\tAccepted.")
+            for errorPosition, errorMessage in errors:
+                print(f"{i + 1}\tUnaccepted at token {errorPosition}. {errorMessage}")
+        return
 
-    for nonTerminal in nonTerminalsArray:
-        if nonTerminal in itemTransitions[itemIndex].keys():
-            destinationIndex = itemTransitions[itemIndex][nonTerminal]
-            cellValues.append(destinationIndex)
+    if arguments.quiet:
+        parser.getPackedTables(not parser.keepUnitReductions)
+        if lexer is None:
+            tokenLists = (line.split() for line in stringLines)
+            results = parseStrings(parser.recognize, tokenLists, arguments.jobs)
         else:
-            cellValues.append("")
-
-    slrTableRows.append(getTableRow(cellValues))
-        
-slrTableHeader = getSlrTableHeader(terminalsArray, nonTerminalsArray)
-slrTable = getTable(slrTableHeader, slrTableRows)
-
-
-
-#---------------------------------------------------------------
-# Parse strings with SLR table
-#---------------------------------------------------------------
+            results = parseStrings(getTextRecognizer(parser, lexer), stringLines, arguments.jobs)
+        for i, (errorPosition, errorMessage) in enumerate(results):
+            if errorPosition is None:
+                print(f"{i + 1}\tAccepted.")
+            else:
+                print(f"{i + 1}\tUnaccepted at token {errorPosition}. {errorMessage}")
+        return
 
-# Parse input strings into lists of tokens
-rawStrings = []
-strings = []
-for i in range(numberOfStrings):
-    line = input().strip()
-    rawStrings.append(line)
-    tokenList = line.split()
-    tokenList.append(EOF)
-    strings.append(tokenList)
-
-# Parse each string with SLR table  
-actionSymbols = terminals.union(EOF)
-parsingErrorData = [None, None]
-
-acceptTableRows = []
-parseTables = []
-
-for i in range(numberOfStrings):
-    stack = [0]
-    string = strings[i].copy()
-    string.reverse()
-
-    parsingErrorData = [False, ""]
-    parsingResultMessage = None
-
-    parseTableRows = []
-    
-    while True:
-        parseCellValues = getStackStringState(stack, string)
-
-        itemIndex = top(stack, "stack")
-        if parsingErrorData[ERROR]: break
-        stringToken = top(string, "input string")
-        if parsingErrorData[ERROR]: break
-        checkTokenInGrammar(stringToken)
-        if parsingErrorData[ERROR]: break
-
-        action = retrieveFromDict(itemActions, itemIndex, stringToken)
-        if parsingErrorData[ERROR]: break
-        actionType = action[0]
-        actionParameter = action[1]
-
-        if actionType == SHIFT:
-            parseCellValues.append(f"Shift {actionParameter}")
-
-            stack.append(string.pop())
-            stack.append(actionParameter)
-
-        elif actionType == REDUCE:
-            parseCellValues.append(f"Reduce {actionParameter}")
-            parseTableRows.append(getTableRow(parseCellValues))
-
-            tokensToRemove = 2 * bodyLength(productions[actionParameter])
-            for j in range(tokensToRemove):
-                top(stack, "stack")
-                if parsingErrorData[ERROR]: break
-                stack.pop()
-            topIndex = top(stack, "stack")
-            if parsingErrorData[ERROR]: break    
-            productionHeader = header(productions[actionParameter])
-            stack.append(productionHeader)
-            
-            # Goto continuation
-            parseCellValues = getStackStringState(stack, string)
-            parseCellValues.append(f"Goto {destinationIndex}")
-
-            destinationIndex = retrieveFromDict(itemTransitions, topIndex, productionHeader)
-            if parsingErrorData[ERROR]: break
-            stack.append(destinationIndex)
-
-        elif actionType == ACCEPT:
-            parsingResultMessage = "Accepted."
-
-            parseCellValues.append("Accept")
-            parseTableRows.append(getTableRow(parseCellValues))
-
-            break
-        
-        parseTableRows.append(getTableRow(parseCellValues))
-
-    if parsingErrorData[ERROR]:
-        parsingResultMessage = f"Unaccepted. {parsingErrorData[MESSAGE]}"
-
-        parseCellValues = getStackStringState(stack, string)
-        parseCellValues.append(parsingErrorData[MESSAGE])
-        parseTableRows.append(getTableRow(parseCellValues))
-
-    acceptTableRow = getTableRow([rawStrings[i], parsingResultMessage])
-    acceptTableRows.append(acceptTableRow)
-
-    parseTableHeader = getTableHeader(["Stack", "String", "Action to perform"])
-    parseTable = getTable(parseTableHeader, parseTableRows)
-    parseTables.append(parseTable)
-
-acceptTableHeader = getTableHeader(["Input string", "Parse result"])
-acceptTable = getTable(acceptTableHeader, acceptTableRows)
-
-tableHeadings = ["SLR analysis table", "Input string parse results", "SLR tree item data"]
-for i in range(len(parseTables)):
-    tableHeadings.append(f"Parse process for string #{i + 1}")
-
-htmlDoc = getHtmlDoc(tableHeadings, [slrTable, acceptTable, treeTable] + parseTables)
-print(htmlDoc)
\ No newline at end of file
+    # Parse input strings into lists of tokens as they are read, keeping
+    # only the raw strings whose results haven't been written yet
+    pendingRawStrings = deque()
+    def readStrings():
+        for line in stringLines:
+            line = line.strip()
+            pendingRawStrings.append(line)
+            yield getTokenList(line, lexer)
+
+    # Parse results and processes are written to temporary files as they are
+    # produced, and copied in order into the final document at the end
+    acceptTableFile = tempfile.TemporaryFile("w+", encoding="utf-8")
+    parseTablesFile = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    acceptTableHeader = getTableHeader(["Input string", "Parse result"])
+    writeTableStart(acceptTableFile, acceptTableHeader)
+
+    if arguments.dense_tables or arguments.compressed_tables:
+        parser.getPackedTables()
+    parseFunction = parser.parse if lexer is None else getTextParser(parser)
+    results = parseStrings(parseFunction, readStrings(), arguments.jobs)
+    for i, (parseSteps, parsingResultMessage) in enumerate(results):
+        acceptTableFile.write(getTableRow([pendingRawStrings.popleft(), parsingResultMessage]))
+        writeParseProcess(parseTablesFile, i + 1, parseSteps)
+
+    writeTableEnd(acceptTableFile)
+
+    outputFile = sys.stdout
+    writeHtmlDocStart(outputFile)
+    writeHtmlHeading(outputFile, "SLR analysis table")
+    writeSlrTable(outputFile, table)
+    outputFile.write("\n")
+    writeHtmlSection(outputFile, "Input string parse results", acceptTableFile)
+    writeHtmlHeading(outputFile, "SLR tree item data")
+    writeTreeTable(outputFile, table)
+    outputFile.write("\n")
+    parseTablesFile.seek(0)
+    shutil.copyfileobj(parseTablesFile, outputFile)
+    writeHtmlDocEnd(outputFile)
+
+if __name__ == "__main__":
+    main()
@@ -8,56 +8,8 @@
 
 import sys
 
-def reachedEnd(line, i):
-    return (i >= len(line))
+from grammar_analysis import Grammar
 
-def isBlank(char):
-    return (char in {" ", "\t"})
-
-def skipBlanks(line, i):
-    while not reachedEnd(line, i) and isBlank(line[i]):
-        i += 1
-    return i
-
-def nextCharIs(line, i, char):
-    return (not reachedEnd(line, i+1) and line[i+1] == char)
-
-def addToken(tokenList, token):
-    if not token in tokenList:
-        tokenList.append(token)
-
-def parseLine(line, headerTokens, productionTokens):
-    i = 0
-    inHeader = True
-    while not reachedEnd(line, i):
-        i = skipBlanks(line, i)
-        if reachedEnd(line, i): break
-
-        # ->
-        if line[i] == '-':
-            if(nextCharIs(line, i, '>')):
-                inHeader = False
-                i += 2
-                continue
-
-        # ' '
-        elif line[i] == '\'':
-            while not reachedEnd(line, i) and line[i] != '\'':
-                i += 1
-            i += 1
-
-        # Every other token
-        else:
-            token = ""
-            while not reachedEnd(line, i) and not isBlank(line[i]):
-                token += line[i]
-                i += 1
-
-            if inHeader:
-                addToken(headerTokens, token)
-            else:
-                addToken(productionTokens, token)
-            
 def printSet(set):
     resultString = ""
     SEPARATOR = ", "
@@ -65,30 +17,25 @@ def printSet(set):
         resultString += item + SEPARATOR
     return resultString[:-len(SEPARATOR)]
 
-inputFileName = sys.argv[1]
-inputFile = open(inputFileName, 'r')
-n = int(inputFile.readline().strip())
-
-headerTokens = []
-productionTokens = []
+def main():
+    inputFileName = sys.argv[1]
+    with open(inputFileName, 'r') as inputFile:
+        n = int(inputFile.readline().strip())
+        grammar = Grammar.fromLines(inputFile.readline() for i in range(n))
 
-for i in range(n):
-    line = inputFile.readline().strip()
-    parseLine(line, headerTokens, productionTokens)
-    
-inputFile.close()
+    # Symbols are listed in order of first appearance
+    productionTokens = grammar.orderedTerminals
+    headerTokens = grammar.orderedNonTerminals
 
-for token in headerTokens:
-    if token in productionTokens:
-        productionTokens.remove(token)
+    # Print results to console
+    print(f"Terminal: {printSet(productionTokens)}")
+    print(f"Non terminal: {printSet(headerTokens)}")
 
-# Print results to console
-print(f"Terminal: {printSet(productionTokens)}")
-print(f"Non terminal: {printSet(headerTokens)}")
+    # Print results to file
+    outputFileName = sys.argv[2]
+    with open(outputFileName, 'w') as outputFile:
+        print(f"Terminal: {printSet(productionTokens)}", file = outputFile)
+        print(f"Non terminal: {printSet(headerTokens)}", file = outputFile)
 
-# Print results to file
-outputFileName = sys.argv[2]
-outputFile = open(outputFileName, 'w')
-print(f"Terminal: {printSet(productionTokens)}", file = outputFile)
-print(f"Non terminal: {printSet(headerTokens)}", file = outputFile)
-outputFile.close()
\ No newline at end of file
+if __name__ == "__main__":
+    main()